@@ -22,9 +22,9 @@ LIABILITY, WHETHER IN AN ACTION OF CONTRACT, TORT OR OTHERWISE, ARISING FROM,
 OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 SOFTWARE.'''
 
-from .ctcore import Style, Table
+from .ctcore import ColumnTable, StreamTable, Style, Table
 
-__all__ = ['Style', 'Table']
+__all__ = ['ColumnTable', 'StreamTable', 'Style', 'Table']
 
 name = 'colorfultable'
 
@@ -22,8 +22,9 @@
 # OUT OF OR IN CONNECTION WITH THE SOFTWARE OR THE USE OR OTHER DEALINGS IN THE
 # SOFTWARE.
 
+import sys
 from os import name as os_name
-from sys import stdout as sys_stdout
+from threading import Lock
 
 # 终端中用于控制颜色的字符
 # 详见：https://en.wikipedia.org/wiki/ANSI_escape_code（包括数字颜色代码）
@@ -33,48 +34,86 @@ _CSI_T = 'm'
 
 # 程序运行于 IDLE 上的标志
 # 关心是否运行于 IDLE Shell 上是因为 IDLE 不支持前背景色，需要区别对待
+# 导入本模块时不做检测，第一次彩色渲染时由 _detect 函数设置，检测前总是 False
 run_on_idle = False
-# 导入 IDLE 相关模块成功标志
-_idle_imported = False
 # 导入第三方模块 colorama 标志
 _colorama_imported = False
 # 运行于 windows 平台标志
 _NT = os_name == 'nt'
+# 是否已检测过运行环境，及保证只检测一次的锁
+_detected = False
+_DETECT_LOCK = Lock()
 
-# 尝试导入 IDLE 输出流，成功则设置 _idle_imported 为 True
-try:
-    from idlelib.run import StdOutputFile
 
-    _idle_imported = True
-except Exception:
-    pass
-
-# 导入成功也不代表运行 IDLE 上，要看输出流是否是上面导入的 StdOutputFile
-if _idle_imported:
-    run_on_idle = isinstance(sys_stdout, StdOutputFile)
+def _idle_output_file():
+    '''
+    获取 IDLE 的输出流类 StdOutputFile。
+    程序运行于 IDLE 上时 idlelib.run 模块必然已被 IDLE 导入，所以只从已导入的模块中
+    查找，不主动导入 idlelib（导入它会连带导入 tkinter 等一长串模块，很慢）。
+    :return: type|None，未运行于 IDLE 上时为 None。
+    '''
+    return getattr(sys.modules.get('idlelib.run'), 'StdOutputFile', None)
 
-# 如果程序是运行在 windows 平台上并且不是运行于 IDLE
-# 那就需要 colorama 模块帮助显示字符颜色
-# 其他平台直接输入终端颜色代码即可达到目的，没 windows 这么麻烦
-if _NT and not run_on_idle:
-    try:
-        from colorama import init, Fore, Back
 
-        # 导入 colorama 的输出流 StreamWrapper，主模块用于判断输出流是否非文件
-        from colorama.ansitowin32 import StreamWrapper
+def _stream_wrapper():
+    '''
+    获取 colorama 的输出流类 StreamWrapper，主模块用于判断输出流是否非文件。
+    只有 colorama 已被导入时才可能存在它的输出流，所以同样只从已导入的模块中查找。
+    :return: type|None，colorama 未被导入时为 None。
+    '''
+    return getattr(
+        sys.modules.get('colorama.ansitowin32'), 'StreamWrapper', None
+    )
 
-        # 设置 colorama 导入标志为真
-        _colorama_imported = True
-        # colorama 用法，设置自动结束颜色为真
-        init(autoreset=True)
-    except ImportError:
-        # 导入失败（没安装 colorama 模块等原因）显示提示
-        from warnings import warn
 
-        warn(
-            'If you want to print in color on the windows console, '
-            'please use "pip3 install colorama" to install the "colorama" module.'
-        )
+def _detect():
+    '''
+    检测是否运行于 IDLE 上，运行于 windows 平台的终端上时导入并初始化 colorama。
+    只在第一次调用时检测（第一次彩色渲染时由 _ColorGroup 和主模块 ctcore 调用），
+    之后直接返回，导入本模块本身不做这些耗时的操作。
+    '''
+    global run_on_idle, _colorama_imported, _detected
+    if _detected:
+        return
+    with _DETECT_LOCK:
+        if _detected:
+            return
+        # 运行 IDLE 上时输出流是 IDLE 的 StdOutputFile
+        idle_output_file = _idle_output_file()
+        if idle_output_file is not None:
+            run_on_idle = isinstance(sys.stdout, idle_output_file)
+        # 如果程序是运行在 windows 平台上并且不是运行于 IDLE
+        # 那就需要 colorama 模块帮助显示字符颜色
+        # 其他平台直接输入终端颜色代码即可达到目的，没 windows 这么麻烦
+        if _NT and not run_on_idle:
+            try:
+                from colorama import init, Fore, Back
+
+                # colorama 用法，设置自动结束颜色为真
+                init(autoreset=True)
+                # 将"颜色组 _ColorGroup"的颜色属性设置为 colorama 对应的颜色属性
+                _ColorGroup._use_colorama(Fore, Back)
+                # 设置 colorama 导入标志为真
+                _colorama_imported = True
+            except ImportError:
+                # 导入失败（没安装 colorama 模块等原因）显示提示
+                from warnings import warn
+
+                warn(
+                    'If you want to print in color on the windows console, '
+                    'please use "pip3 install colorama" to install the '
+                    '"colorama" module.'
+                )
+        _detected = True
+
+
+def _on_idle():
+    '''
+    程序是否运行于 IDLE 上，第一次调用时检测。
+    :return: bool。
+    '''
+    _detect()
+    return run_on_idle
 
 
 class MixedColors(object):
@@ -181,77 +220,58 @@ class Monochrome(object):
 
 
 class _ColorGroup(object):
-    # 运行于 widdows 平台并且 colorama 模块成功导入
-    # 则将本"颜色组 _ColorGroup"对应颜色属性设置为 colorama 对应的颜色属性
-    if _NT and _colorama_imported:
-        fg_reset = Fore.RESET
-        fg_red = Fore.RED
-        fg_green = Fore.GREEN
-        fg_yellow = Fore.YELLOW
-        fg_blue = Fore.BLUE
-        fg_magenta = Fore.MAGENTA
-        fg_cyan = Fore.CYAN
-        fg_white = Fore.WHITE
-        fg_brightblack = Fore.LIGHTBLACK_EX
-        fg_brightred = Fore.LIGHTRED_EX
-        fg_brightgreen = Fore.LIGHTGREEN_EX
-        fg_brightyellow = Fore.LIGHTYELLOW_EX
-        fg_brightblue = Fore.LIGHTBLUE_EX
-        fg_brightmagenta = Fore.LIGHTMAGENTA_EX
-        fg_brightcyan = Fore.LIGHTCYAN_EX
-        fg_brightwhite = Fore.LIGHTWHITE_EX
-
-        bg_reset = Back.RESET
-        bg_red = Back.RED
-        bg_green = Back.GREEN
-        bg_yellow = Back.YELLOW
-        bg_blue = Back.BLUE
-        bg_magenta = Back.MAGENTA
-        bg_cyan = Back.CYAN
-        bg_white = Back.WHITE
-        bg_brightblack = Back.LIGHTBLACK_EX
-        bg_brightred = Back.LIGHTRED_EX
-        bg_brightgreen = Back.LIGHTGREEN_EX
-        bg_brightyellow = Back.LIGHTYELLOW_EX
-        bg_brightblue = Back.LIGHTBLUE_EX
-        bg_brightmagenta = Back.LIGHTMAGENTA_EX
-        bg_brightcyan = Back.LIGHTCYAN_EX
-        bg_brightwhite = Back.LIGHTWHITE_EX
-    else:
-        # 运行于其他平台则用数字颜色代码来构建颜色
-        fg_reset = 0
-        fg_red = 31
-        fg_green = 32
-        fg_yellow = 33
-        fg_blue = 34
-        fg_magenta = 35
-        fg_cyan = 36
-        fg_white = 37
-        fg_brightblack = 90
-        fg_brightred = 91
-        fg_brightgreen = 92
-        fg_brightyellow = 93
-        fg_brightblue = 94
-        fg_brightmagenta = 95
-        fg_brightcyan = 96
-        fg_brightwhite = 97
-
-        bg_reset = 0
-        bg_red = 41
-        bg_green = 42
-        bg_yellow = 43
-        bg_blue = 44
-        bg_magenta = 45
-        bg_cyan = 46
-        bg_white = 47
-        bg_brightblack = 100
-        bg_brightred = 101
-        bg_brightgreen = 102
-        bg_brightyellow = 103
-        bg_brightblue = 104
-        bg_brightmagenta = 105
-        bg_brightcyan = 106
-        bg_brightwhite = 107
+    # 默认用数字颜色代码来构建颜色，运行于 windows 平台的终端上时，第一次彩色渲染时由
+    # _detect 函数调用 _use_colorama 方法换成 colorama 对应的颜色属性
+    fg_reset = 0
+    fg_red = 31
+    fg_green = 32
+    fg_yellow = 33
+    fg_blue = 34
+    fg_magenta = 35
+    fg_cyan = 36
+    fg_white = 37
+    fg_brightblack = 90
+    fg_brightred = 91
+    fg_brightgreen = 92
+    fg_brightyellow = 93
+    fg_brightblue = 94
+    fg_brightmagenta = 95
+    fg_brightcyan = 96
+    fg_brightwhite = 97
+
+    bg_reset = 0
+    bg_red = 41
+    bg_green = 42
+    bg_yellow = 43
+    bg_blue = 44
+    bg_magenta = 45
+    bg_cyan = 46
+    bg_white = 47
+    bg_brightblack = 100
+    bg_brightred = 101
+    bg_brightgreen = 102
+    bg_brightyellow = 103
+    bg_brightblue = 104
+    bg_brightmagenta = 105
+    bg_brightcyan = 106
+    bg_brightwhite = 107
+
+    @classmethod
+    def _use_colorama(cls, fore, back):
+        '''
+        将本"颜色组 _ColorGroup"各颜色属性设置为 colorama 对应的颜色属性，
+        如 fg_red 对应 Fore.RED，bg_brightblack 对应 Back.LIGHTBLACK_EX。
+        :param fore: colorama.Fore。
+        :param back: colorama.Back。
+        '''
+        for name, value in list(vars(cls).items()):
+            if not isinstance(value, int):
+                continue
+            ground, _, tone = name.partition('_')
+            if tone.startswith('bright'):
+                tone = 'light%s_ex' % tone[len('bright') :]
+            colorama_group = fore if ground == 'fg' else back
+            setattr(cls, name, getattr(colorama_group, tone.upper()))
 
     def __getattr__(self, name):
         # 访问本类不存在的属性会调用此方法，一律抛出异常
@@ -259,6 +279,8 @@ class _ColorGroup(object):
 
     def __getattribute__(self, name):
         # 定义获取本类属性的魔法方法
+        # 第一次取颜色属性时检测运行环境，运行于 windows 平台时可能换成 colorama 的属性
+        _detect()
         # 如果运行于 windows 平台且 colorama 模块没导入成功
         # 则访问本类属性时返回空字符串（主模块 ctcore 中用于与其他字符串相加）
         if _NT and not _colorama_imported:
@@ -274,3 +296,31 @@ class _ColorGroup(object):
 
 # 实例化颜色组，供主模块 ctcore 导入使用
 _colors = _ColorGroup()
+
+# 颜色集合编译缓存：{frozenset(颜色名称): (设置颜色前缀, 重置颜色后缀)}
+_AFFIXES = dict()
+
+
+def _color_affix(names):
+    '''
+    将颜色名称集合编译为 (设置颜色前缀, 重置颜色后缀)，同一颜色集合只编译一次。
+    "前缀 + 字符串 + 后缀"与"颜色逐个相加再加字符串"的结果相同。
+    :param names: set[str]，颜色名称集合，可用值见 _ColorGroup 类属性名。
+    :return: tuple[str, str]，设置颜色前缀和重置颜色后缀，无颜色时都为空字符串。
+    '''
+    key = frozenset(names)
+    affix = _AFFIXES.get(key)
+    if affix is not None:
+        return affix
+    mixed = ''
+    for name in names:
+        mixed += getattr(_colors, name)
+    if isinstance(mixed, MixedColors):
+        # 与 MixedColors.__add__ 中生成的设置颜色码、重置颜色码相同
+        string = _CSI_S.join(str(c) for c in mixed.codes)
+        affix = ''.join((_CSI_H, string, _CSI_T)), '\033[0m'
+    else:
+        # colorama 的颜色属性是字符串，直接相加即可，由 colorama 自动重置颜色
+        affix = mixed, ''
+    _AFFIXES[key] = affix
+    return affix
@@ -27,26 +27,26 @@
 ###########################################
 
 import sys
-from collections.abc import Generator
+from bisect import bisect_right
+from collections import Counter
 from collections.abc import Iterable
-from collections.abc import Iterator
-from io import TextIOWrapper
+from functools import partial
+from io import BufferedIOBase, RawIOBase, TextIOWrapper
 from os import linesep as os_linesep
 from os import name as os_name
+from os import write as os_write
 
-from .colors import _colors, run_on_idle
+# IDLE、colorama 相关的检测和初始化推迟到第一次彩色渲染时，见 colors._detect 函数
+from .colors import (
+    _AFFIXES,
+    _color_affix,
+    _colors,
+    _detect,
+    _idle_output_file,
+    _on_idle,
+    _stream_wrapper,
+)
 
-try:
-    from .colors import StreamWrapper
-except ImportError:
-    StreamWrapper = TextIOWrapper
-
-try:
-    from .colors import StdOutputFile
-except ImportError:
-    StdOutputFile = TextIOWrapper
-
-_COLOR = True
 _LNSEP = os_linesep
 _NT = os_name == 'nt'
 
@@ -54,6 +54,12 @@ MAX_ROW_HEIGHT = 20
 MAX_COLUMN_WIDTH = 80
 MAX_COLUMN_NUM = 30
 
+# show 方法默认每攒够多少个字符写入一次输出流
+_CHUNK_SIZE = 64 * 1024
+# fromCSV、fromArray 等方法每多少行批量插入一次表格，过大时存活的临时对象多，垃圾
+# 回收反而更慢
+_INSERT_BATCH = 1000
+
 __ALIGNH__ = 'l left c center r right'
 __ALIGNV__ = 't top m middle b bottom'
 __STYLES__ = 'table simple classic table-ascii simple-ascii classic-ascii'
@@ -255,11 +261,248 @@ class Style(object):
         super().__setattr__(name, value)
 
 
+class _WidthTally(object):
+    '''
+    列宽计数器，记录一列中每种宽度值出现的次数（计数多重集合）。
+    增删单元格时只需增减对应宽度的计数，不必重新扫描整列即可得到该列的最大宽度。
+    '''
+
+    __slots__ = ('_counts', 'max')
+
+    def __init__(self, widths=()):
+        '''
+        初始化方法。
+        :param widths: Iterable[int]，该列已有单元格的宽度值。
+        '''
+        # 宽度计数字典，{宽度值: 出现次数}
+        self._counts = dict()
+        # 当前最大宽度值，列中没有单元格时为 0
+        self.max = 0
+        for width in widths:
+            self.add(width)
+
+    def add(self, width):
+        '''
+        计入一个宽度值。
+        :param width: int，宽度值。
+        '''
+        self._counts[width] = self._counts.get(width, 0) + 1
+        if width > self.max:
+            self.max = width
+
+    def update(self, widths):
+        '''
+        批量计入多个宽度值，先用 Counter 统计各宽度值的个数再合并。
+        :param widths: Iterable[int]，宽度值。
+        '''
+        counted = Counter(widths)
+        if not counted:
+            return
+        for width, count in counted.items():
+            self._counts[width] = self._counts.get(width, 0) + count
+        self.max = max(self.max, max(counted))
+
+    def __contains__(self, width):
+        return width in self._counts
+
+    def copy(self):
+        '''
+        复制计数器。
+        :return: _WidthTally，新的计数器。
+        '''
+        tally = _WidthTally()
+        tally._counts = dict(self._counts)
+        tally.max = self.max
+        return tally
+
+    def remove(self, width):
+        '''
+        移除一个宽度值，只有最大宽度值的计数归零时才需要在剩余的不同宽度值中重新找最大值。
+        :param width: int，宽度值，应是之前计入过的值。
+        '''
+        count = self._counts[width] - 1
+        if count:
+            self._counts[width] = count
+            return
+        del self._counts[width]
+        if width == self.max:
+            self.max = max(self._counts) if self._counts else 0
+
+
+class _RowSampler(object):
+    '''
+    行抽样器，用于抽样估计列宽：最先的 head 行全部入样，其后的行用蓄水池抽样方法
+    保留最多 size 行，每一行入样的概率相同，不必事先知道总行数。
+    '''
+
+    __slots__ = ('head', 'size', 'seen', 'rows', '_random')
+
+    def __init__(self, head, size, seed=None):
+        '''
+        初始化方法。
+        :param head: int，全部入样的开头行数。
+        :param size: int，蓄水池（开头行以外的样本）容量。
+        :param seed: 随机数种子，同 random.Random 的参数，默认 None。
+        '''
+        # 抽样只在启用时才需要，随用随导入
+        from random import Random
+
+        self.head = head
+        self.size = size
+        # 已经过抽样的行数（含开头行）
+        self.seen = 0
+        # 蓄水池中的样本行
+        self.rows = list()
+        self._random = Random(seed)
+
+    def offer(self, row):
+        '''
+        对一个新行进行抽样。
+        :param row: _RowObj，新行。
+        :return: tuple[bool, _RowObj|None]，(新行是否入样, 被挤出蓄水池的样本行)。
+        '''
+        self.seen += 1
+        if self.seen <= self.head:
+            return True, None
+        if len(self.rows) < self.size:
+            self.rows.append(row)
+            return True, None
+        index = self._random.randrange(self.seen - self.head)
+        if index >= self.size:
+            return False, None
+        evicted, self.rows[index] = self.rows[index], row
+        return True, evicted
+
+    def discard(self, row):
+        '''
+        样本行被删除时将其移出蓄水池（按对象身份比较，不按行内容比较）。
+        :param row: _RowObj，被删除的行。
+        '''
+        for index, sample in enumerate(self.rows):
+            if sample is row:
+                del self.rows[index]
+                return
+
+    def replace(self, row, new_row):
+        '''
+        样本行被复制替换（写时复制）时，蓄水池中改为保存新行。
+        :param row: _RowObj，被替换的行。
+        :param new_row: _RowObj，替换它的新行。
+        '''
+        for index, sample in enumerate(self.rows):
+            if sample is row:
+                self.rows[index] = new_row
+                return
+
+
+# 单元格格式驻留表：(水平对齐, 垂直对齐, 颜色集合) -> 同值的不可变元组，格式相同的
+# 单元格、"行"共用同一个元组对象，不再为每个单元格单独创建对齐方式和颜色集合
+_FORMATS = dict()
+
+
+def _cell_format(alignh, alignv, fbgc):
+    '''
+    取得驻留的单元格格式元组。
+    :param alignh: str，水平对齐方式，可用值见全局变量 __ALIGNH__。
+    :param alignv: str，垂直对齐方式，可用值见全局变量 __ALIGNV__。
+    :param fbgc: Iterable[str]|None，前景色背景色集合。
+    :return: tuple[str, str, frozenset[str]]，格式元组。
+    '''
+    key = (alignh, alignv, frozenset(fbgc or ()))
+    return _FORMATS.setdefault(key, key)
+
+
+def _fmt_copy(fmt):
+    '''
+    复制格式元组，其中已通过 getColor 交给外部的可变颜色集合也复制一份，其他格式元组
+    不可变，原样返回。
+    :param fmt: tuple|None，格式元组。
+    :return: tuple|None。
+    '''
+    if fmt is None or not isinstance(fmt[2], set):
+        return fmt
+    return fmt[0], fmt[1], set(fmt[2])
+
+
+class _RenderContext(object):
+    '''
+    渲染参数：是否彩色、换行符、单元格填充、垂直边框线、是否合并颜色控制码。
+    渲染时作为参数一层层传给 _getrowtext、_form、_format、_format_o 等，不修改任何
+    全局变量，所以多个线程可以同时以不同的参数渲染表格。创建后不应再修改。
+    '''
+
+    __slots__ = (
+        'color',
+        'lnsep',
+        'padding',
+        'left_vert',
+        'center_vert',
+        'right_vert',
+        'compact',
+        'key',
+    )
+
+    def __init__(
+        self,
+        color,
+        padding,
+        left_vert='',
+        center_vert='',
+        right_vert='',
+        compact=False,
+        lnsep=_LNSEP,
+    ):
+        '''
+        初始化方法。
+        :param color: bool，是否输出颜色控制码。
+        :param padding: str，单元格内容两侧填充。
+        :param left_vert: str，左垂直边框线。
+        :param center_vert: str，中间垂直边框线。
+        :param right_vert: str，右垂直边框线。
+        :param compact: bool，是否合并相邻的相同颜色控制码，见 _join_compact 函数。
+        :param lnsep: str，"表格行"中各文本行之间的换行符，默认 os.linesep。
+        '''
+        self.color = color
+        self.lnsep = lnsep
+        self.padding = padding
+        self.left_vert = left_vert
+        self.center_vert = center_vert
+        self.right_vert = right_vert
+        self.compact = compact
+        # 以上参数组成的元组，用作行文本缓存键的一部分
+        self.key = (
+            color,
+            lnsep,
+            padding,
+            left_vert,
+            center_vert,
+            right_vert,
+            compact,
+        )
+
+
 class _RowObj(list):
     '''
     表格的"行"类，继承自 list。
+    "行"只保存一个默认格式元组，与默认格式不同的单元格才记入稀疏的格式覆盖字典。
     '''
 
+    __slots__ = (
+        '_default',
+        '_overrides',
+        '_row_hit',
+        '_col_wids',
+        '_text',
+        '_clr_exposed',
+        '_strs',
+        '_wids',
+        '_flrs',
+        '_wraps',
+        '_sampled',
+        '_hit',
+        '_epoch',
+    )
+
     def __init__(self, iterable, cwhandle, rowhit, alignh, alignv, fbgc):
         '''
         初始化方法。
@@ -274,22 +517,153 @@ class _RowObj(list):
         '''
         # 调用父类初始化方法初始化，即 list(iterable)，此时实例 self 就是一个列表。
         super().__init__(iterable)
-        # 单元格水平对齐方式属性，类型为 str，可用值见 __ALIGNH__ 全局变量。
-        self._alignh = alignh
-        # 单元格垂直对齐方式属性，类型为 str，可用值见 __ALIGNV__ 全局变量。
-        self._alignv = alignv
-        # 根据"行"(_RowObj 实例，self)中单元格(列表元素)数量生成水平对齐方式列表。
-        self._alignhs = [alignh] * len(self)
-        # 根据"行"(_RowObj 实例，self)中单元格(列表元素)数量生成垂直对齐方式列表。
-        self._alignvs = [alignv] * len(self)
-        # 单元格前景色背景色集合属性，类型为 set[str]。
-        self._fbgc = fbgc
-        # 根据"行"(_RowObj 实例，self)中单元格(列表元素)数量生成前背景色列表:list[set[str]]。
-        self._fbgcs = [fbgc.copy() for _ in self]
+        # 单元格默认格式，驻留的 (水平对齐, 垂直对齐, 颜色集合) 元组。
+        self._default = _cell_format(alignh, alignv, fbgc)
+        # 格式覆盖字典 {列索引: 格式元组}，只记录格式与默认格式不同的单元格，无则为 None。
+        self._overrides = None
         # 行高属性，int。
         self._row_hit = rowhit
         # 列宽列表属性，list。
         self._col_wids = cwhandle
+        # 已渲染的"行"的文本缓存 (渲染参数键, 文本)，行内容或格式改变时置为 None，
+        # 下次渲染时重新生成文本，未改变的行则直接使用缓存的文本。键和文本放在一个元组
+        # 里一次读写，多个线程同时渲染时不会读到不配套的键和文本。
+        self._text = None
+        # 单元格颜色集合已通过 getColor 交给外部（外部可能随时修改），此后每次都重新渲染
+        self._clr_exposed = False
+        # 单元格缓存：各单元格的字符串形式、显示宽度、最大单个字符宽度，首次用到时由
+        # _measure 方法一次生成，单元格被覆写、增删时随之更新
+        self._strs = None
+        self._wids = None
+        self._flrs = None
+        # 单元格按列宽折行的结果 {列索引: ((列宽, 是否自底部折行), 小行元组)}
+        self._wraps = None
+        # 单元格宽度是否计入所在表格的列宽计数器，抽样估计列宽时未入样的行为 False
+        self._sampled = True
+        # "行"输出时所占的文本行数缓存 (列宽元组, 文本行数)，行内容、列宽等改变时失效
+        self._hit = None
+        # 创建（或复制）时所在表格的快照代数，小于表格当前代数说明与快照共用，修改前
+        # 要先复制，见 Table._owned 方法
+        self._epoch = 0
+
+    def __setitem__(self, index, value):
+        '''
+        覆写单元格（列表元素）时使缓存的文本失效，并重新测量该单元格。
+        '''
+        self._text = self._hit = None
+        super().__setitem__(index, value)
+        self._wraps = None
+        if self._strs is None:
+            return
+        if isinstance(index, int):
+            string, width, floor = _measure_cell(value)
+            self._strs[index] = string
+            self._wids[index] = width
+            self._flrs[index] = floor
+        else:
+            # 切片赋值，下次用到时整行重新测量
+            self._strs = self._wids = self._flrs = None
+
+    def _measure(self):
+        '''
+        测量"行"中所有单元格，生成单元格缓存。
+        '''
+        strs, wids, flrs = list(), list(), list()
+        for value in self:
+            string, width, floor = _measure_cell(value)
+            strs.append(string)
+            wids.append(width)
+            flrs.append(floor)
+        # 测量完毕再一起赋值，同时渲染同一行的其他线程不会读到只测量了一部分的缓存
+        self._wids, self._flrs = wids, flrs
+        self._strs = strs
+
+    def _copy(self, epoch, colors=False):
+        '''
+        复制"行"，供写时复制和快照使用。单元格元素、格式覆盖字典和单元格缓存都复制
+        一份，缓存的折行结果、文本等不可变对象直接共用。
+        :param epoch: int，新行的快照代数。
+        :param colors: bool，是否连同已交给外部的可变颜色集合一起复制，此后外部修改
+        原集合不再影响新行。
+        :return: _RowObj，新行。
+        '''
+        row = _RowObj(self, self._col_wids, self._row_hit, *self._default)
+        if self._overrides:
+            row._overrides = dict(self._overrides)
+            if colors:
+                for index, fmt in row._overrides.items():
+                    row._overrides[index] = _fmt_copy(fmt)
+        if colors:
+            row._clr_exposed = False
+        else:
+            row._clr_exposed = self._clr_exposed
+            row._text = self._text
+        if self._strs is not None:
+            row._wids, row._flrs = list(self._wids), list(self._flrs)
+            row._strs = list(self._strs)
+        if self._wraps:
+            row._wraps = dict(self._wraps)
+        row._sampled = self._sampled
+        row._hit = self._hit
+        row._epoch = epoch
+        return row
+
+    def _wrap(self, index, width, bottom):
+        '''
+        获取单元格按列宽折行后的小行列表，列宽和折行方向不变时直接使用缓存。
+        :param index: int，非负列索引。
+        :param width: int，列宽。
+        :param bottom: bool，是否从字符串末尾开始折行（垂直对齐方式为底部对齐时）。
+        :return: list[str]，小行列表，是缓存的副本，可以修改。
+        '''
+        key = (width, bottom)
+        if self._wraps is None:
+            self._wraps = dict()
+        else:
+            cached = self._wraps.get(index)
+            if cached is not None and cached[0] == key:
+                return list(cached[1])
+        split = _rsplit if bottom else _lsplit
+        lines = split(self._strs[index], width)
+        self._wraps[index] = (key, tuple(lines))
+        return lines
+
+    def _colindex(self, index):
+        '''
+        将列索引转换为非负索引，超出范围则抛出异常。
+        :param index: int，列索引。
+        :return: int，非负列索引。
+        '''
+        length = len(self)
+        if index < 0:
+            index += length
+        if not 0 <= index < length:
+            raise IndexError('Column index out of range.')
+        return index
+
+    def _cellfmt(self, index):
+        '''
+        获取单元格的格式元组。
+        :param index: int，非负列索引。
+        :return: tuple，(水平对齐, 垂直对齐, 颜色集合)。
+        '''
+        if self._overrides:
+            return self._overrides.get(index, self._default)
+        return self._default
+
+    def _override(self, index, fmt):
+        '''
+        设置单元格的格式元组，与默认格式相同则移除覆盖记录。
+        :param index: int，非负列索引。
+        :param fmt: tuple，格式元组。
+        '''
+        if fmt is self._default:
+            if self._overrides:
+                self._overrides.pop(index, None)
+        elif self._overrides is None:
+            self._overrides = {index: fmt}
+        else:
+            self._overrides[index] = fmt
 
     def _addcol(self, index, value):
         '''
@@ -297,13 +671,26 @@ class _RowObj(list):
         :param index: int，要插入位置索引，即列索引。
         :param value: 要插入的值，不限数据类型。
         '''
-        # 给"行"插入一个单元格（元素）。
-        self.insert(index, value)
-        # 同时对水平、垂直对齐方式列表同样位置插入默认对齐方式。
-        self._alignhs.insert(index, self._alignh)
-        self._alignvs.insert(index, self._alignv)
-        # 前背景色列表也在相同位置插入默认颜色集合。
-        self._fbgcs.insert(index, self._fbgc.copy())
+        self._text = self._hit = None
+        # 按 list.insert 的规则求出实际插入位置，其后单元格的格式覆盖记录后移一位
+        length = len(self)
+        if index < 0:
+            position = max(index + length, 0)
+        else:
+            position = min(index, length)
+        # 给"行"插入一个单元格（元素），新单元格使用默认格式。
+        self.insert(position, value)
+        self._wraps = None
+        if self._strs is not None:
+            string, width, floor = _measure_cell(value)
+            self._strs.insert(position, string)
+            self._wids.insert(position, width)
+            self._flrs.insert(position, floor)
+        if self._overrides:
+            self._overrides = {
+                (i + 1 if i >= position else i): fmt
+                for i, fmt in self._overrides.items()
+            }
 
     def _delcol(self, index):
         '''
@@ -311,10 +698,20 @@ class _RowObj(list):
         :param index: int，要删除的列索引。
         :return: 返回被删除的元素。
         '''
-        # 水平、垂直对齐方式列表和前背景色列表也做相应的删除操作。
-        del self._fbgcs[index]
-        del self._alignhs[index]
-        del self._alignvs[index]
+        self._text = self._hit = None
+        index = self._colindex(index)
+        # 删除该单元格的格式覆盖记录，其后单元格的记录前移一位
+        if self._overrides:
+            self._overrides = {
+                (i - 1 if i > index else i): fmt
+                for i, fmt in self._overrides.items()
+                if i != index
+            }
+        self._wraps = None
+        if self._strs is not None:
+            del self._strs[index]
+            del self._wids[index]
+            del self._flrs[index]
         return self.pop(index)
 
     def _height(self, height):
@@ -322,6 +719,7 @@ class _RowObj(list):
         设置行高方法，即将"行"的"行高"属性设置为给出的行高。
         :param height: int，可用值为 0 和正整数。
         '''
+        self._text = self._hit = None
         self._row_hit = height
 
     def _setclr(self, index, clrs):
@@ -330,12 +728,16 @@ class _RowObj(list):
         :param index: int，索引参数。
         :param clrs: set[str]，颜色集合。
         '''
-        self._fbgcs[index].clear()
-        if not clrs:
+        self._text = None
+        index = self._colindex(index)
+        alignh, alignv, fbgc = self._cellfmt(index)
+        # 已通过 getColor 交给外部的可变集合，原地修改，使外部持有的集合保持有效
+        if isinstance(fbgc, set):
+            fbgc.clear()
+            if clrs:
+                fbgc.update(clrs)
             return
-        if not isinstance(clrs, set):
-            clrs = set(clrs)
-        self._fbgcs[index].update(clrs)
+        self._override(index, _cell_format(alignh, alignv, clrs))
 
     def _getclr(self, index):
         '''
@@ -343,18 +745,41 @@ class _RowObj(list):
         :param index: int，列索引参数。
         :return: set，单元格的颜色集合。
         '''
-        return self._fbgcs[index]
+        index = self._colindex(index)
+        self._clr_exposed = True
+        alignh, alignv, fbgc = self._cellfmt(index)
+        if isinstance(fbgc, set):
+            return fbgc
+        # 外部可能修改返回的集合，所以为该单元格单独创建一个可变集合
+        fbgc = set(fbgc)
+        self._override(index, (alignh, alignv, fbgc))
+        return fbgc
 
-    def _getrowtext(self, left_vert, center_vert, right_vert, padding):
+    def _getrowtext(self, ctx, key=None, store=True, col_wids=None):
         '''
         获取"行"的文本格式的方法，即将各单元格所存对象的字符，按对齐、颜色、垂直边框线等要求
         构建的文本格式。
-        :param left_vert: str，左垂直边框线。
-        :param center_vert: str，中间垂直边框线。
-        :param right_vert: str，右垂直边框线。
-        :param padding: str，单元格内容两侧填充。
+        :param ctx: _RenderContext，渲染参数（是否彩色、换行符、填充、垂直边框线等）。
+        :param key: tuple，渲染参数键（列宽及 ctx.key），不为 None 时按其中的列宽渲染
+        并缓存渲染结果，下次以同一个键对象调用且行未改变则直接返回缓存的文本。
+        :param store: bool，为 False 时只读取已有的缓存，新渲染的文本不存入缓存。
+        :param col_wids: Sequence[int]，key 为 None 时使用的列宽，默认 None 即"行"
+        的列宽列表。
         :return: str，构建完成的"行"的文本格式。
         '''
+        if key is not None:
+            cached = self._text
+            if (
+                cached is not None
+                and cached[0] is key
+                and not self._clr_exposed
+            ):
+                return cached[1]
+            # 按键中的列宽渲染，与快照共用的行不受原表格列宽变化的影响
+            text = self._getrowtext(ctx, col_wids=key[0])
+            if store:
+                self._keep(key, text)
+            return text
         # 假设"行"的源数据为：['0123', 'abcdefg', 'h', '']
         # 假设列宽：[3, 3, 3, 2]，行高为 0 (自动)，水平对齐为 c，垂直对齐为 m。
         # 则 _form 方法的返回值是以下数据形式：
@@ -363,16 +788,68 @@ class _RowObj(list):
         # 小行 2：[' 3 '， 'def'， ' h ', '  '],
         # 小行 3：['   '， ' g '， '   ', '  '],
         # ]
-        row_fmted = self._form(padding)
+        if ctx.compact and ctx.color:
+            # 单元格不带颜色控制码格式化，拼接文本行时再按需插入颜色控制码
+            prefixes = list()
+            for fbgc in self._cellfmts()[2]:
+                prefix, suffix = _color_affix(fbgc) if fbgc else ('', '')
+                prefixes.append(prefix)
+                # 只能合并 ANSI 颜色控制码，colorama 等其他方式按原样输出
+                if prefix and suffix != _SGR_RESET:
+                    break
+            else:
+                row_fmted = self._form(ctx, False, col_wids)
+                if not row_fmted:
+                    return
+                return ctx.lnsep.join(
+                    _join_compact(line, prefixes, ctx) for line in row_fmted
+                )
+        row_fmted = self._form(ctx, col_wids=col_wids)
         if not row_fmted:
             return
         for line in row_fmted:
             # 为每个文本行的最左、最右分别加上"左(left_vert)右(right_vert)垂直边框线"
-            line[0] = ''.join((left_vert, line[0]))
-            line[-1] = ''.join((line[-1], right_vert))
+            line[0] = ''.join((ctx.left_vert, line[0]))
+            line[-1] = ''.join((line[-1], ctx.right_vert))
         # 用"中间垂直边框线(center_vert)"把"文本行"列表串成字符串形式
         # 每个"文本行"之间用换行符串起来，得到一个"表格行"的字符串形式并返回
-        return _LNSEP.join(center_vert.join(line) for line in row_fmted)
+        return ctx.lnsep.join(ctx.center_vert.join(line) for line in row_fmted)
+
+    def _keep(self, key, text):
+        '''
+        将渲染结果存入行文本缓存。
+        :param key: tuple，渲染参数键。
+        :param text: str，"行"的字符串形式。
+        '''
+        self._text = (key, text)
+
+    def _lines(self, key):
+        '''
+        计算"行"输出时所占的文本行数（不含边框线），不渲染整行，结果按 key 缓存。
+        :param key: tuple，当前列宽元组，同一列宽下应传入同一个元组对象，按其中的列宽
+        计算。
+        :return: int，文本行数。
+        '''
+        cached = self._hit
+        if cached is not None and cached[0] is key:
+            return cached[1]
+        if self._row_hit:
+            height = self._row_hit
+        else:
+            if self._strs is None:
+                self._measure()
+            height = 1
+            for index, width in enumerate(key):
+                # 不超过列宽且不含换行符的单元格只占一行，不必折行
+                if (
+                    self._wids[index] <= width
+                    and '\n' not in self._strs[index]
+                ):
+                    continue
+                bottom = self._cellfmt(index)[1].lower() in ('b', 'bottom')
+                height = max(height, len(self._wrap(index, width, bottom)))
+        self._hit = (key, height)
+        return height
 
     def _colcap(self, index):
         '''
@@ -380,8 +857,9 @@ class _RowObj(list):
         :param index: int，列索引。
         :return: int，最大列宽值。
         '''
-        # 注意列宽不能为 0，所以 "..or 1"
-        return _str_wid(str(self[index])) or 1
+        if self._strs is None:
+            self._measure()
+        return self._wids[index]
 
     def _colflr(self, index):
         '''
@@ -389,11 +867,9 @@ class _RowObj(list):
         :param index: int，列索引。
         :return: int，列宽值下限。
         '''
-        # 注意，列宽下限值由列中最大的单个字符宽度决定
-        string = str(self[index])
-        if not string:
-            return 1  # 下限不能为 0
-        return max(_chr_wid(c) for c in string)
+        if self._strs is None:
+            self._measure()
+        return self._flrs[index]
 
     def _align(self, index, alignh, alignv):
         '''
@@ -402,14 +878,36 @@ class _RowObj(list):
         :param alignh: str，水平对齐方式，可用值见 __ALIGNH__ 全局变量。
         :param alignv: str，垂直对齐方式，可用值见 __ALIGNV__ 全局变量。
         '''
-        if alignh is not None:
-            # 将"表格行"的水平对齐方式列表对应索引单元格水平对齐设置为 alignh
-            self._alignhs[index] = alignh
-        if alignv is not None:
-            # 将"表格行"的垂直对齐方式列表对应索引单元格垂直对齐设置为 alignv
-            self._alignvs[index] = alignv
+        self._text = self._hit = None
+        index = self._colindex(index)
+        old_alignh, old_alignv, fbgc = self._cellfmt(index)
+        if alignh is None:
+            alignh = old_alignh
+        if alignv is None:
+            alignv = old_alignv
+        if isinstance(fbgc, set):
+            # 颜色集合已交给外部，保留同一个可变集合，不做驻留
+            self._override(index, (alignh, alignv, fbgc))
+        else:
+            self._override(index, _cell_format(alignh, alignv, fbgc))
+
+    def _cellfmts(self):
+        '''
+        由默认格式和格式覆盖字典展开各单元格的对齐方式和颜色集合。
+        :return: tuple[list, list, list]，(水平对齐列表, 垂直对齐列表, 颜色集合列表)。
+        '''
+        alignh, alignv, fbgc = self._default
+        alignhs = [alignh] * len(self)
+        alignvs = [alignv] * len(self)
+        fbgcs = [fbgc] * len(self)
+        if self._overrides:
+            for index, (alignh, alignv, fbgc) in self._overrides.items():
+                alignhs[index] = alignh
+                alignvs[index] = alignv
+                fbgcs[index] = fbgc
+        return alignhs, alignvs, fbgcs
 
-    def _form(self, padding):
+    def _form(self, ctx, colored=True, col_wids=None):
         '''
         创建一个已格式化的"表格行"的二维列表形式，最外层列表表示一个"表格行"，
         每个内层列表表示"表格行"里的每个单元格，内层列表里的元素表示单元格里不同小行的
@@ -418,8 +916,10 @@ class _RowObj(list):
         转换成另一个形式：每个内层列表表示一个小行，小行包含多个单元格，但只包含单元格
         里的一部分(一个单元格里几个小行中的一个)，就如 _getrowtext 方法中对本方法返回
         值的示意图所示。
-        :param padding: str，单元格里左右填充字符，用于防止单元格内容过于贴近垂直边
-        框线。
+        :param ctx: _RenderContext，渲染参数，其中的 padding 是单元格里左右填充字符，
+        用于防止单元格内容过于贴近垂直边框线。
+        :param colored: bool，是否给单元格加上颜色控制码（ctx.color 为真时），默认 True。
+        :param col_wids: Sequence[int]，列宽，默认 None 即"行"的列宽列表。
         :return: list[list[str]]，已格式化的"表格行"的二维列表形式，如下：
             假设"行"的源数据为：['0123', 'abcdefg', 'h', '']
             假设列宽：[3, 3, 3, 2]，行高为 0 (自动)，水平对齐为 c，垂直对齐为 m。
@@ -433,14 +933,30 @@ class _RowObj(list):
         # 如果源数据为空(即添加的行是空行，但一般不会出现)
         if not self:
             return
+        alignhs, alignvs, fbgcs = self._cellfmts()
+        if not colored:
+            fbgcs = [None] * len(self)
+        if self._strs is None:
+            self._measure()
+        if col_wids is None:
+            col_wids = self._col_wids
+        # 各单元格按列宽折行，未改变的单元格直接使用缓存的折行结果
+        cells = [
+            self._wrap(
+                index,
+                col_wids[index],
+                alignvs[index].lower() in ('b', 'bottom'),
+            )
+            for index in range(len(self))
+        ]
         row_with_cells = _format(
-            self,
+            cells,
             self._row_hit,
-            self._col_wids,
-            self._alignhs,
-            self._alignvs,
-            self._fbgcs,
-            padding,
+            col_wids,
+            alignhs,
+            alignvs,
+            fbgcs,
+            ctx,
         )
         # 将已格式化的"表格行"的二维列表形式转换成最终形式
         row_with_lines = [list(tup) for tup in zip(*row_with_cells)]
@@ -509,31 +1025,49 @@ class Table(list):
         headlist = list(header)
         # 本类实例添加首行 _RowObj 类实例。因为本类实例和_RowObj类实例都是列表，所以可以用
         # 访问二维列表一样的方法访问本类实例中的源数据(已添加的行、列、单元格)
-        self.append(
-            _RowObj(
-                headlist,  # header
-                self._col_wids,  # 最终列宽列表
-                self._row_fixed,  # 行高
-                self._alignh,  # 水平对齐方式
-                'bottom',  # 垂直对齐方式
-                self._fbgcolors,  # 前背景色集合
-            )
+        head_row = _RowObj(
+            headlist,  # header
+            self._col_wids,  # 最终列宽列表
+            self._row_fixed,  # 行高
+            self._alignh,  # 水平对齐方式
+            'bottom',  # 垂直对齐方式
+            self._fbgcolors,  # 前背景色集合
         )
+        # ColumnTable 等子类禁用了 append 等 list 方法，直接调用 list 的方法
+        list.append(self, head_row)
         self._num_rows = 1  # 行数
         self._num_cols = len(headlist)  # 列数
-        str_head = _items_to_str(headlist)  # 将 header 中元素转换为字符串用于计算字符宽度等
         # 列固定宽度(用户指定)
         self._col_fixeds = [colfixed for _ in headlist]
         # 列最大宽度(字符串宽度)
-        self._col_caps = [_str_wid(s) or 1 for s in str_head]
+        self._col_caps = [head_row._colcap(i) for i in range(self._num_cols)]
         # 列宽度下限(由列中宽度最大的单个字符决定)
-        self._col_floors = [_max_char_wid(s) for s in str_head]
+        self._col_floors = [head_row._colflr(i) for i in range(self._num_cols)]
+        # 每列的宽度计数器，增删行、覆写单元格时据此增量更新列宽上、下限
+        self._cap_tallies = [_WidthTally((w,)) for w in self._col_caps]
+        self._floor_tallies = [_WidthTally((w,)) for w in self._col_floors]
+        # 行抽样器，为 None 时所有行都计入列宽计数器，见 setSampling 方法
+        self._sampler = None
+        # pages 方法按终端高度分页的结果：(列宽元组, 每页可用行数, 总行数, 分页列表)
+        self._page_index = None
+        # 是否合并相邻的相同颜色控制码，见 setCompact 方法
+        self._compact = False
         # 边框线的部分组合，依次为：
         # 最顶层一行边框线(hat)、首行与主体分隔线(neck)、
-        # 主体中各行直接的分隔线(belt)、最底层一行边框线(shoes)
-        self._border = dict(hat='', neck='', belt='', shoes='', tail='')
-        self._foot_text = ''
+        # 主体中各行直接的分隔线(belt)、最底层一行边框线(shoes)、脚注下边框线(tail)，
+        # 以及脚注文本(foot)。每次 _refresh 都生成新的字典，不修改旧字典
+        self._border = dict(
+            hat='', neck='', belt='', shoes='', tail='', foot=''
+        )
+        # 上次渲染时使用的渲染参数键，参数不变时沿用同一个键对象，各行据此判断缓存是否有效
+        self._text_key = None
         self._foot_orign = list()
+        # 快照代数，每创建一个快照加 1，代数小于它的行与快照共用，见 _owned 方法
+        self._epoch = 0
+        # 是否是快照，快照不能修改单元格内容、格式和增删行列
+        self._frozen = False
+        # 是否有单元格的颜色集合已通过 getColor 交给外部，见 snapshot 方法
+        self._clr_exposed = False
 
     @staticmethod
     def _check_init(header, alignh, alignv, rowfixed, colfixed, fbgc, style):
@@ -602,6 +1136,37 @@ class Table(list):
             if -self._num_cols > colindex >= self._num_cols:
                 raise IndexError('Column index out of range.')
 
+    def _check_frozen(self):
+        '''
+        快照不能修改单元格内容、格式和增删行列，是快照则抛出异常。
+        '''
+        if self._frozen:
+            raise TypeError('A table snapshot cannot be modified.')
+
+    def _check_resizable(self):
+        '''
+        检查能否增删行、列，增删行列的公共方法开始时调用，不能则抛出 TypeError 异常。
+        '''
+        self._check_frozen()
+
+    def _owned(self, index):
+        '''
+        取得要原地修改的第 index 行（写时复制）：该行与快照共用时先复制一份替换表格中
+        的行，快照中的行保持不变。修改行的内容、格式、行高都应通过本方法取行。
+        :param index: int，行索引。
+        :return: _RowObj，只属于本表格的行。
+        '''
+        self._check_frozen()
+        row = self[index]
+        if row._epoch < self._epoch:
+            new_row = row._copy(self._epoch)
+            list.__setitem__(self, index, new_row)
+            # 抽样器中保存的是表格中的行，替换后被挤出蓄水池的才是正确的行
+            if self._sampler is not None and row._sampled:
+                self._sampler.replace(row, new_row)
+            row = new_row
+        return row
+
     def __str__(self):
         '''
         重写 __str__ 魔法方法，使打印本类实例时以表格形式输出，而不是对象内存地址。
@@ -612,6 +1177,436 @@ class Table(list):
     # 将 __repr__ 魔法方法指向 __str__ 方法，输出时用 __str__ 代理。
     __repr__ = __str__
 
+    @classmethod
+    def fromSource(
+        cls,
+        header,
+        source,
+        *,
+        alignh='l',
+        alignv='t',
+        rowfixed=0,
+        colfixed=0,
+        fbgc=None,
+        fill='',
+        style=None,
+    ):
+        '''
+        以已有的行数据源创建表格，不把数据复制到表格中。
+            1.source 可以是可索引的序列（list、tuple、NumPy 记录数组等，需支持 len
+            和按整数索引取行），也可以是任意可迭代对象（如数据库游标），后者会先取出
+            所有行存入一个列表；
+            2.行只在测量列宽、输出时才临时取出并生成行对象，用完即丢弃，表格只记录覆写
+            的单元格、设置的格式和行高，占用内存与行数据源本身相近；
+            3.可以设置颜色、对齐方式、行高、列宽，覆写单元格（不修改数据源），但不能
+            增删行、列；
+            4.数据源中的行多于列数则截断，少于列数则用 fill 补足，表格使用期间数据源不
+            应改变；
+            5.返回的表格是 Table 的一个内部子类，只能通过 Table 调用本方法，通过
+            ColumnTable 等子类调用触发 TypeError 异常；
+            6.表格中不保存行对象，与 ColumnTable 一样不能用 append、clear 等 list 方法
+            增删、替换、重排行（触发 TypeError 异常）。
+        :param header: Iterable，表格首行。
+        :param source: Sequence|Iterable，行数据源，每个元素是一行。
+        其余参数与 Table 类初始化参数相同。
+        :return: Table，以 source 为数据源的表格。
+        '''
+        if cls is not Table:
+            raise TypeError(
+                'fromSource can only be called on Table, not %s.'
+                % cls.__name__
+            )
+        if not isinstance(source, Iterable) and not hasattr(
+            source, '__getitem__'
+        ):
+            raise TypeError(
+                'Iterable parameter <source> expected, got %s.'
+                % type(source).__name__
+            )
+        return _SourceTable(
+            header,
+            source,
+            alignh=alignh,
+            alignv=alignv,
+            rowfixed=rowfixed,
+            colfixed=colfixed,
+            fbgc=fbgc,
+            fill=fill,
+            style=style,
+        )
+
+    @classmethod
+    def fromCSV(
+        cls,
+        file,
+        *,
+        delimiter=',',
+        encoding='utf-8',
+        max_rows=None,
+        columns=None,
+        alignh='l',
+        alignv='t',
+        rowfixed=0,
+        colfixed=0,
+        fbgc=None,
+        fill='',
+        style=None,
+    ):
+        '''
+        从 CSV、TSV 文件创建表格。
+            1.第一行作为标题行，其余行作为主体行，空行跳过；主体行的字段多于标题行则
+            截断，少于标题行则用 fill 补足，与 addRow 方法相同；
+            2.边读边解析，每读取 _INSERT_BATCH 行批量插入一次表格，同时更新列宽上、下限，
+            不先把整个文件读入内存；
+            3.columns 只选取部分列时，未选取的列不存入表格，也不测量宽度。
+        :param file: str|PathLike|文件对象，文件路径或已打开的文件对象（文本文件对象
+        应以 newline='' 打开；二进制文件对象按 encoding 解码），不会关闭传入的文件对象。
+        :param delimiter: str，字段分隔符，默认 ','，TSV 文件用 '\t'。
+        :param encoding: str，文件编码，file 是文本文件对象时不使用，默认 utf-8。
+        :param max_rows: int，最多读取的主体行数，默认 None（全部）。
+        :param columns: Iterable[int|str]，要选取的列（列索引或标题行中的列名），按
+        给出的顺序排列，默认 None（全部列）。
+        其余参数与 Table 类初始化参数相同。
+        :return: Table，与调用本方法的类同类的表格。
+        '''
+        if not (isinstance(max_rows, int) or max_rows is None):
+            raise TypeError(
+                'Integer parameter <max_rows> or "None" expected, got %s.'
+                % type(max_rows).__name__
+            )
+        if max_rows is not None and max_rows < 0:
+            raise ValueError('The value of <max_rows> cannot be less than 0.')
+        if not (isinstance(columns, Iterable) or columns is None):
+            raise TypeError(
+                'Iterable parameter <columns> or "None" expected, got %s.'
+                % type(columns).__name__
+            )
+        options = dict(
+            alignh=alignh,
+            alignv=alignv,
+            rowfixed=rowfixed,
+            colfixed=colfixed,
+            fbgc=fbgc,
+            fill=fill,
+            style=style,
+        )
+        # csv 模块只在导入 CSV 文件时用到，推迟导入以缩短导入本模块的耗时
+        from csv import reader
+        from os import PathLike
+
+        if isinstance(file, (str, bytes, PathLike)):
+            with open(file, encoding=encoding, newline='') as stream:
+                rows = reader(stream, delimiter=delimiter)
+                return cls._read_csv(rows, max_rows, columns, options)
+        if not callable(getattr(file, 'read', None)):
+            raise TypeError(
+                'Parameter <file> should be a path or a file object, got %s.'
+                % type(file).__name__
+            )
+        binary = isinstance(file, (RawIOBase, BufferedIOBase))
+        if binary:
+            file = TextIOWrapper(file, encoding=encoding, newline='')
+        try:
+            rows = reader(file, delimiter=delimiter)
+            return cls._read_csv(rows, max_rows, columns, options)
+        finally:
+            # 解除包装，否则包装对象被回收时会关闭调用者传入的文件对象
+            if binary:
+                file.detach()
+
+    @classmethod
+    def _read_csv(cls, rows, max_rows, columns, options):
+        '''
+        由 csv.reader 逐批读取各行创建表格，参数见 fromCSV 方法。
+        :param rows: Iterator[list[str]]，csv.reader 对象。
+        :param options: dict，Table 类初始化参数。
+        :return: Table，创建的表格。
+        '''
+        header = next((row for row in rows if row), None)
+        if header is None:
+            raise ValueError('The CSV file has no header row.')
+        picks = None
+        if columns is not None:
+            picks = list()
+            for column in columns:
+                if isinstance(column, str):
+                    if column not in header:
+                        raise ValueError(
+                            'No column named <%s> in the header.' % column
+                        )
+                    picks.append(header.index(column))
+                elif isinstance(column, int):
+                    if not -len(header) <= column < len(header):
+                        raise IndexError('Column index out of range.')
+                    picks.append(column % len(header))
+                else:
+                    raise TypeError(
+                        'Column name or index expected, got %s.'
+                        % type(column).__name__
+                    )
+            header = [header[index] for index in picks]
+            last = max(picks, default=-1)
+        table = cls(header, **options)
+        num_cols, filler = table._num_cols, table._filler
+        if max_rows is None:
+            max_rows = -1
+        batch = list()
+        for row in rows:
+            if not max_rows:
+                break
+            # 空行跳过
+            if not row:
+                continue
+            max_rows -= 1
+            if picks is not None:
+                if len(row) > last:
+                    row = [row[index] for index in picks]
+                else:
+                    row = [
+                        row[index] if index < len(row) else filler
+                        for index in picks
+                    ]
+            elif len(row) > num_cols:
+                del row[num_cols:]
+            elif len(row) < num_cols:
+                row.extend([filler] * (num_cols - len(row)))
+            batch.append(row)
+            if len(batch) >= _INSERT_BATCH:
+                table._insert_rows(table._num_rows, batch)
+                batch = list()
+        if batch:
+            table._insert_rows(table._num_rows, batch)
+        return table
+
+    @classmethod
+    def fromCursor(
+        cls,
+        cursor,
+        *,
+        batch_size=1000,
+        max_rows=None,
+        alignh='l',
+        alignv='t',
+        rowfixed=0,
+        colfixed=0,
+        fbgc=None,
+        fill='',
+        style=None,
+    ):
+        '''
+        由 DB-API 游标（如 sqlite3.Cursor）的查询结果创建表格。
+            1.以 cursor.description 中的各列名作为标题行；
+            2.用 cursor.fetchmany 每次取 batch_size 行，整批插入表格并更新列宽上、下
+            限，不先 fetchall 取出全部结果再逐行 addRow，内存中不会同时存在两份结果；
+            3.要边查询边输出，不等查询结束，见 StreamTable.fromCursor 方法。
+        :param cursor: 已执行查询的 DB-API 游标，有 description 属性和 fetchmany 方法。
+        :param batch_size: int，每次 fetchmany 取多少行，默认 1000。
+        :param max_rows: int，最多取多少行，默认 None（全部）。
+        其余参数与 Table 类初始化参数相同。
+        :return: Table，与调用本方法的类同类的表格。
+        '''
+        header = _cursor_header(cursor, batch_size, max_rows)
+        table = cls(
+            header,
+            alignh=alignh,
+            alignv=alignv,
+            rowfixed=rowfixed,
+            colfixed=colfixed,
+            fbgc=fbgc,
+            fill=fill,
+            style=style,
+        )
+        for batch in _fetch_batches(
+            cursor, batch_size, max_rows, table._num_cols, table._filler
+        ):
+            table._insert_rows(table._num_rows, batch)
+        return table
+
+    @classmethod
+    def fromArray(
+        cls,
+        array,
+        *,
+        header=None,
+        alignh='l',
+        alignv='t',
+        rowfixed=0,
+        colfixed=0,
+        fbgc=None,
+        fill='',
+        style=None,
+    ):
+        '''
+        由 numpy 数组创建表格。
+            1.二维数组的每列作为表格的一列，一维结构化数组（含记录数组）的每个字段作为
+            表格的一列，普通一维数组作为只有一列的表格；
+            2.数值、字符串类型的列整批转换为字符串数组（astype(str)），整列都是可打印
+            的 ASCII 字符串时由字符码点数组一次算出各单元格显示宽度，只有含非 ASCII 字
+            符等的列才逐个单元格测量；对象类型的列逐个调用 str，见 _measure_array 函数；
+            3.本模块不导入 numpy，只调用传入的数组的方法，numpy 不是必需的依赖。
+        :param array: numpy.ndarray，二维数组或一维（结构化）数组。
+        :param header: Iterable，标题行，默认 None：结构化数组取各字段名，其他数组取
+        各列的索引。
+        其余参数与 Table 类初始化参数相同。
+        :return: Table，与调用本方法的类同类的表格。
+        '''
+        if not (hasattr(array, 'dtype') and hasattr(array, 'ndim')):
+            raise TypeError(
+                'Parameter <array> should be a numpy array, got %s.'
+                % type(array).__name__
+            )
+        names = array.dtype.names
+        if names and array.ndim == 1:
+            columns = [array[name] for name in names]
+        elif array.ndim == 2 and not names:
+            columns = [array[:, index] for index in range(array.shape[1])]
+            names = range(len(columns))
+        elif array.ndim == 1:
+            columns, names = [array], [0]
+        else:
+            raise ValueError(
+                'A 2-dimensional array or a 1-dimensional array expected, '
+                'got %d-dimensional.' % array.ndim
+            )
+        return cls._from_arrays(
+            names if header is None else header,
+            columns,
+            dict(
+                alignh=alignh,
+                alignv=alignv,
+                rowfixed=rowfixed,
+                colfixed=colfixed,
+                fbgc=fbgc,
+                fill=fill,
+                style=style,
+            ),
+        )
+
+    @classmethod
+    def fromDataFrame(
+        cls,
+        frame,
+        *,
+        index=False,
+        alignh='l',
+        alignv='t',
+        rowfixed=0,
+        colfixed=0,
+        fbgc=None,
+        fill='',
+        style=None,
+    ):
+        '''
+        由 pandas.DataFrame 创建表格，以各列名作为标题行。各列取出其 numpy 数组后按
+        fromArray 方法的方式整列测量；日期时间类型的列转换为 Timestamp 等对象，与
+        pandas 自己的显示形式一致。本模块不导入 pandas，pandas 不是必需的依赖。
+        :param frame: pandas.DataFrame，数据表。
+        :param index: bool，是否把行索引作为表格的第一列，默认 False。
+        其余参数与 Table 类初始化参数相同。
+        :return: Table，与调用本方法的类同类的表格。
+        '''
+        if not (hasattr(frame, 'columns') and hasattr(frame, 'iloc')):
+            raise TypeError(
+                'Parameter <frame> should be a pandas DataFrame, got %s.'
+                % type(frame).__name__
+            )
+        header = list(frame.columns)
+        # 按位置取列，列名重复时也不会取错
+        columns = [
+            _frame_column(frame.iloc[:, colind])
+            for colind in range(len(header))
+        ]
+        if index:
+            name = frame.index.name
+            header.insert(0, '' if name is None else name)
+            columns.insert(0, _frame_column(frame.index))
+        return cls._from_arrays(
+            header,
+            columns,
+            dict(
+                alignh=alignh,
+                alignv=alignv,
+                rowfixed=rowfixed,
+                colfixed=colfixed,
+                fbgc=fbgc,
+                fill=fill,
+                style=style,
+            ),
+        )
+
+    @classmethod
+    def _from_arrays(cls, header, columns, options):
+        '''
+        由各列的 numpy 一维数组创建表格，每 _INSERT_BATCH 行整批测量、插入一次。
+        :param header: Iterable，标题行。
+        :param columns: list[numpy.ndarray]，各列数组，长度相同。
+        :param options: dict，Table 类初始化参数。
+        :return: Table，创建的表格。
+        '''
+        if not isinstance(header, Iterable):
+            raise TypeError(
+                'Iterable parameter <header> expected, got %s.'
+                % type(header).__name__
+            )
+        header = list(header)
+        if len(header) != len(columns):
+            raise ValueError(
+                'The length of <header> should be equal to the number '
+                'of columns.'
+            )
+        table = cls(header, **options)
+        num_rows = len(columns[0]) if columns else 0
+        for start in range(0, num_rows, _INSERT_BATCH):
+            stop = start + _INSERT_BATCH
+            parts = [_measure_array(column[start:stop]) for column in columns]
+            row_lists = list(zip(*(part[0] for part in parts)))
+            table._insert_rows(
+                table._num_rows, row_lists, [part[1:] for part in parts]
+            )
+        return table
+
+    def snapshot(self):
+        '''
+        Table 类实例的快照方法，返回表格当前状态的只读副本，供其他线程输出。
+            1.快照与原表格共用各行，不复制单元格：之后原表格修改某一行时才先复制该行
+            （写时复制），增删行只改变原表格自己的行列表，所以创建快照只需复制行的引用
+            列表和列宽、风格、脚注等设置，耗时很短；
+            2.快照不能修改单元格内容、格式，不能增删行列（触发 TypeError 异常），可以
+            设置风格、列宽、脚注等输出选项，不影响原表格；
+            3.输出快照时不加锁，也不读取原表格的任何可变数据，原表格的修改不会阻塞，
+            也不必等待输出完成。快照本身应在修改表格的线程中创建（或与修改操作互斥）；
+            4.只有通过 Table 的方法修改才会写时复制，直接修改行对象（如
+            table[1][0] = 'x'）会同时改变快照。
+        :return: Table，与本表格同类的快照。
+        '''
+        # 只在创建快照时用到，推迟导入以缩短导入本模块的耗时
+        from copy import copy
+
+        snap = self.__class__.__new__(self.__class__)
+        snap.__dict__.update(self.__dict__)
+        # 复制行的引用，跳过 ColumnTable 等子类的视图：它们的行数据由子类自行复制
+        list.extend(snap, list.__iter__(self))
+        snap._frozen = True
+        # 现有的行从此与快照共用，原表格修改它们之前要先复制，见 _owned 方法
+        self._epoch += 1
+        snap._epoch = self._epoch
+        snap.rowTexts = list(self.rowTexts)
+        snap._fbgcolors = set(self._fbgcolors)
+        snap._style = copy(self._style)
+        snap._col_wids = list(self._col_wids)
+        snap._col_fixeds = list(self._col_fixeds)
+        snap._col_caps = list(self._col_caps)
+        snap._col_floors = list(self._col_floors)
+        snap._cap_tallies = [tally.copy() for tally in self._cap_tallies]
+        snap._floor_tallies = [tally.copy() for tally in self._floor_tallies]
+        snap._foot_orign = list(self._foot_orign)
+        # 颜色集合已通过 getColor 交给外部的行，外部随时可能修改集合，快照中换成副本
+        if self._clr_exposed:
+            for index, row in enumerate(list.__iter__(snap)):
+                if row._clr_exposed:
+                    list.__setitem__(snap, index, row._copy(snap._epoch, True))
+        return snap
+
     def addColumn(self, colindex, column=None):
         '''
         Table 实例对象的插入列方法。
@@ -620,6 +1615,7 @@ class Table(list):
         :param colindex: int, 插入位置索引。
         :param column: Iterable, 要插入的列。
         '''
+        self._check_resizable()
         # 如果要插入的列 column 值是 None (column 参数默认值是 None)，
         # 则说明 addColumn 方法只接收到一个参数 colindex，而我们规定接收到的参数
         # 默认是要插入的列，所以要交换一下参数值，colindex 值给 column，column 的值赋值
@@ -644,9 +1640,22 @@ class Table(list):
                 % MAX_COLUMN_NUM
             )
         # 如果 column 是生成器、迭代器，要转换为列表好进行索引操作
-        column = list(column)
+        self._insert_column(colindex, list(column))
+
+    def _insert_column(self, colindex, column):
+        '''
+        插入列，参数已由 addColumn 方法检查。
+        :param colindex: int，插入位置索引。
+        :param column: list，要插入的列。
+        '''
+        # 换算成 list.insert 实际插入的位置，否则各行插入单元格后再按索引统计新列的
+        # 宽度时，负索引会指向新列右边的一列，超出列数的索引会越界
+        if colindex < 0:
+            colindex += self._num_cols
+        colindex = min(max(colindex, 0), self._num_cols)
         # 枚举本类实例(self)里的行
-        for row_ind, row_obj in enumerate(self):
+        for row_ind in range(len(self)):
+            row_obj = self._owned(row_ind)
             try:
                 # 要被插入到本行的元素 obj_to_be_added，从 column
                 # 抓取对应元素 column[row_ind]
@@ -665,10 +1674,15 @@ class Table(list):
         self._num_cols += 1
         # 固定列宽列表相应列位置也要插入列宽值，插入的值使用默认列宽 self._col_fixed
         self._col_fixeds.insert(colindex, self._col_fixed)
-        # 调用本类的 _find_cap、_find_floor 方法分别找出所有行相应列的列宽上限下限值
+        # 统计所有行相应列的单元格宽度，生成该列的宽度计数器
         # 并在上限、下限值列表相应插入值
-        self._col_caps.insert(colindex, self._find_cap(colindex))
-        self._col_floors.insert(colindex, self._find_floor(colindex))
+        sampled = [row for row in self if row._sampled]
+        cap_tally = _WidthTally(row._colcap(colindex) for row in sampled)
+        floor_tally = _WidthTally(row._colflr(colindex) for row in sampled)
+        self._cap_tallies.insert(colindex, cap_tally)
+        self._floor_tallies.insert(colindex, floor_tally)
+        self._col_caps.insert(colindex, cap_tally.max)
+        self._col_floors.insert(colindex, floor_tally.max)
 
     def addRow(self, rowindex, row=None):
         '''
@@ -678,6 +1692,7 @@ class Table(list):
         :param rowindex: int, 插入位置索引。
         :param row: Iterable, 要插入的行。
         '''
+        self._check_resizable()
         # 同插入列方法 addColumn
         if row is None:
             row, rowindex = rowindex, self._num_rows
@@ -700,6 +1715,14 @@ class Table(list):
         # 如果要添加的行的元素数量比现有表格的列数少，则用 fill 扩充要添加的行列表
         elif len_row < self._num_cols:
             row_list.extend([self._filler] * (self._num_cols - len_row))
+        self._insert_row(rowindex, row_list)
+
+    def _insert_row(self, rowindex, row_list):
+        '''
+        插入一行，参数已由 addRow 方法检查，row_list 长度已与列数一致。
+        :param rowindex: int，插入位置索引。
+        :param row_list: list，要插入的行。
+        '''
         # 以要添加的行列表等为初始参数，实例化行类 _RowObj
         row_list = _RowObj(
             row_list,
@@ -709,19 +1732,109 @@ class Table(list):
             self._alignv,
             self._fbgcolors,
         )
+        row_list._epoch = self._epoch
         # 将行类 _RowObj 实例添加进现有表格实例(self)相应位置
         self.insert(rowindex, row_list)
         # 行数计数加 1
         self._num_rows += 1
-        # 分别调用行 _RowObj 实例 _find_cap、_find_floor 方法
-        # 重新查找每列的字符宽度上限、下限，并分别更新列宽度上、下限列表
-        for colind in range(self._num_cols):
-            self._col_caps[colind] = self._find_cap(colind)
-            self._col_floors[colind] = self._find_floor(colind)
+        # 将新行各单元格宽度计入各列宽度计数器，并更新列宽度上、下限列表
+        self._admit(row_list)
 
-    def getColumn(self, colindex=-1):
+    def addRows(self, rowindex, rows=None):
         '''
-        获取列源数据方法。
+        Table 实例的批量插入行方法。
+            1.每一行的处理方式与 addRow 相同：列数多则截断，列数少则用 filler 补足；
+            2.可不带索引参数 rowindex，默认把所有行追加到所有行末尾；
+            3.rows 可以是任意可迭代对象（包括生成器），每批只更新一次列宽上、下限。
+        :param rowindex: int, 插入位置索引，各行按原顺序从该位置开始插入。
+        :param rows: Iterable[Iterable], 要插入的行。
+        '''
+        self._check_resizable()
+        # 同插入行方法 addRow
+        if rows is None:
+            rows, rowindex = rowindex, self._num_rows
+        if not isinstance(rowindex, int):
+            raise TypeError(
+                'Integer parameter <rowindex> expected, got %s.'
+                % type(rowindex).__name__
+            )
+        if not isinstance(rows, Iterable):
+            raise TypeError(
+                'Iterable parameter <rows> expected, got %s.'
+                % type(rows).__name__
+            )
+        num_cols, filler = self._num_cols, self._filler
+        row_lists = list()
+        for row in rows:
+            if not isinstance(row, Iterable):
+                raise TypeError(
+                    'Iterable row expected, got %s.' % type(row).__name__
+                )
+            row_list = list(row)
+            len_row = len(row_list)
+            if len_row > num_cols:
+                row_list = row_list[:num_cols]
+            elif len_row < num_cols:
+                row_list.extend([filler] * (num_cols - len_row))
+            row_lists.append(row_list)
+        if not row_lists:
+            return
+        self._insert_rows(rowindex, row_lists)
+
+    def _insert_rows(self, rowindex, row_lists, measured=None):
+        '''
+        批量插入行，参数已由 addRows 方法检查，各行长度已与列数一致。
+        :param rowindex: int，插入位置索引，各行按原顺序从该位置开始插入。
+        :param row_lists: list[list]，要插入的行，不为空。
+        :param measured: list[tuple]，调用者已测量好的各列 (各字符串形式, 各显示宽度,
+        各最大单个字符宽度)，同 _measure_column 函数的返回值，默认 None（在此测量）。
+        '''
+        num_cols = self._num_cols
+        new_rows = [
+            _RowObj(
+                row_list,
+                self._col_wids,
+                self._row_fixed,
+                self._alignh,
+                self._alignv,
+                self._fbgcolors,
+            )
+            for row_list in row_lists
+        ]
+        if self._epoch:
+            for row_obj in new_rows:
+                row_obj._epoch = self._epoch
+        # 用切片赋值一次性插入所有新行，插入位置与 insert 方法一致
+        self[rowindex:rowindex] = new_rows
+        self._num_rows += len(new_rows)
+        # 抽样估计列宽时逐行抽样，只统计入样的行
+        if self._sampler is not None:
+            for row_obj in new_rows:
+                self._admit(row_obj)
+            return
+        # 按列整批测量各单元格，再转置为各行的单元格缓存，不逐行调用 _measure
+        if measured is None:
+            measured = [_measure_column(column) for column in zip(*row_lists)]
+        if not measured:
+            return
+        strs_rows = zip(*(cells[0] for cells in measured))
+        wids_rows = zip(*(cells[1] for cells in measured))
+        flrs_rows = zip(*(cells[2] for cells in measured))
+        for row_obj, strs, wids, flrs in zip(
+            new_rows, strs_rows, wids_rows, flrs_rows
+        ):
+            row_obj._wids, row_obj._flrs = list(wids), list(flrs)
+            row_obj._strs = list(strs)
+        # 整批统计各列单元格宽度，每列只更新一次列宽度上、下限
+        for colind, (_, wids, flrs) in enumerate(measured):
+            self._cap_tallies[colind].update(wids)
+            self._floor_tallies[colind].update(flrs)
+            self._col_caps[colind] = self._cap_tallies[colind].max
+            self._col_floors[colind] = self._floor_tallies[colind].max
+
+    def getColumn(self, colindex=-1):
+        '''
+        获取列源数据方法。
         :param colindex: int，要获取的列的索引。
         :return: list[any...]，要获取的列的列表形式。
         '''
@@ -776,28 +1889,22 @@ class Table(list):
         self._check_index(rowindex, colindex)
         # 如果行索引和列索引都为 None 则覆写所有单元格
         if rowindex is None and colindex is None:
-            for row in self:
+            for rowind in range(self._num_rows):
+                row = self._owned(rowind)
                 for colind in range(self._num_cols):
-                    row[colind] = value
-                    self._col_caps[colind] = self._find_cap(colind)
-                    self._col_floors[colind] = self._find_floor(colind)
+                    self._write(row, colind, value)
         # 如果行索引、列索引其中之一为 None，则覆写整列或整行
         elif rowindex is None or colindex is None:
             if rowindex is None:
-                for row in self:
-                    row[colindex] = value
-                self._col_caps[colindex] = self._find_cap(colindex)
-                self._col_floors[colindex] = self._find_floor(colindex)
+                for rowind in range(self._num_rows):
+                    self._write(self._owned(rowind), colindex, value)
             else:
+                row = self._owned(rowindex)
                 for colind in range(self._num_cols):
-                    self[rowindex][colind] = value
-                    self._col_caps[colind] = self._find_cap(colind)
-                    self._col_floors[colind] = self._find_floor(colind)
+                    self._write(row, colind, value)
         # 都不为 None 则只覆写指定坐标的单元格
         else:
-            self[rowindex][colindex] = value
-            self._col_caps[colindex] = self._find_cap(colindex)
-            self._col_floors[colindex] = self._find_floor(colindex)
+            self._write(self._owned(rowindex), colindex, value)
 
     def clearCell(self, rowindex=None, colindex=None):
         '''
@@ -864,6 +1971,7 @@ class Table(list):
         :param colindex: int, 要删除的列的索引值。
         :return: list, 以列表形式返回已删除的列。
         '''
+        self._check_resizable()
         # 检查输入参数类型等是否符号要求
         if not isinstance(colindex, int):
             raise TypeError(
@@ -872,14 +1980,24 @@ class Table(list):
             )
         if -self._num_cols > colindex >= self._num_cols:
             raise IndexError('Column index out of range.')
+        return self._remove_column(colindex)
+
+    def _remove_column(self, colindex):
+        '''
+        删除列，参数已由 delColumn 方法检查。
+        :param colindex: int，要删除的列的索引值。
+        :return: list，已删除的列。
+        '''
         # 列计数 -1
         self._num_cols -= 1
         # 相应的列固定宽度列表、列宽上限列表、列宽下限列表也要删除相应列宽度数据
         del self._col_fixeds[colindex]
         del self._col_caps[colindex]
         del self._col_floors[colindex]
+        del self._cap_tallies[colindex]
+        del self._floor_tallies[colindex]
         # 列表推导式中调用 _RowObj 类(行)实例的 _delcol 方法并将新列表(删除的列)返回
-        return [row._delcol(colindex) for row in self]
+        return [self._owned(i)._delcol(colindex) for i in range(len(self))]
 
     def delRow(self, rowindex):
         '''
@@ -889,6 +2007,7 @@ class Table(list):
         :param rowindex: int, 要删除的行的索引值。
         :return: list, 以列表形式返回已删除的行。
         '''
+        self._check_resizable()
         # 检查输入参数类型等是否符号要求
         if not isinstance(rowindex, int):
             raise TypeError(
@@ -897,15 +2016,25 @@ class Table(list):
             )
         if -self._num_rows > rowindex >= self._num_rows:
             raise IndexError('Row index out of range.')
-        # 调用 Table 实例(列表)的 pop 方法删除指定行，得到被删除行的返回值
-        rowlist = list(self.pop(rowindex))
+        return self._remove_row(rowindex)
+
+    def _remove_row(self, rowindex):
+        '''
+        删除行，参数已由 delRow 方法检查。
+        :param rowindex: int，要删除的行的索引值。
+        :return: list，已删除的行。
+        '''
+        # 调用 Table 实例(列表)的 pop 方法删除指定行，得到被删除行
+        row_obj = self.pop(rowindex)
         # 行计数 -1
         self._num_rows -= 1
-        # 调用 Table 实例的 _find_cap、_find_floor 方法更新所有列的宽度上、下限数据
-        for colindex in range(self._num_cols):
-            self._col_caps[colindex] = self._find_cap(colindex)
-            self._col_floors[colindex] = self._find_floor(colindex)
-        return rowlist
+        # 从各列宽度计数器中移除被删除行的单元格宽度，并更新所有列的宽度上、下限数据
+        if row_obj._sampled:
+            if self._sampler is not None:
+                self._sampler.discard(row_obj)
+            for colindex in range(self._num_cols):
+                self._count_out(row_obj, colindex)
+        return list(row_obj)
 
     def setColumnWidth(self, colindex, width=None):
         '''
@@ -983,10 +2112,10 @@ class Table(list):
             # 调用 _RowObj （行）实例的 _height 方法设置行高
             # 因为行高属性是 _RowObj 实例属性
             # （这点做的不好，列宽是 Table 实例属性，行高是 _RowObj 实例属性，不统一）
-            for row in self:
-                row._height(height)
+            for rowind in range(self._num_rows):
+                self._owned(rowind)._height(height)
             return
-        self[rowindex]._height(height)
+        self._owned(rowindex)._height(height)
 
     def setAlignment(
         self, rowindex=None, colindex=None, *, alignh=None, alignv=None
@@ -1035,22 +2164,24 @@ class Table(list):
             if -self._num_cols > colindex >= self._num_cols:
                 raise IndexError('Column index out of range.')
             # 调用 _RowObj（行）实例的 _align 方法设置对齐方式，以下同理
-            self[rowindex]._align(colindex, alignh, alignv)
+            self._owned(rowindex)._align(colindex, alignh, alignv)
         elif rowindex is None and colindex is None:
             for rowind in range(self._num_rows):
+                row = self._owned(rowind)
                 for colind in range(self._num_cols):
-                    self[rowind]._align(colind, alignh, alignv)
+                    row._align(colind, alignh, alignv)
         elif rowindex is None or colindex is None:
             if rowindex is not None:
                 if -self._num_rows > rowindex >= self._num_rows:
                     raise IndexError('Row index out of range.')
+                row = self._owned(rowindex)
                 for colind in range(self._num_cols):
-                    self[rowindex]._align(colind, alignh, alignv)
+                    row._align(colind, alignh, alignv)
             elif colindex is not None:
                 if -self._num_cols > colindex >= self._num_cols:
                     raise IndexError('Column index out of range.')
-                for row in self:
-                    row._align(colindex, alignh, alignv)
+                for rowind in range(self._num_rows):
+                    self._owned(rowind)._align(colindex, alignh, alignv)
 
     def setColor(self, rowindex=None, colindex=None, *, clrs=None):
         '''
@@ -1086,22 +2217,24 @@ class Table(list):
                 raise IndexError('Row index out of range.')
             if -self._num_cols > colindex >= self._num_cols:
                 raise IndexError('Column index out of range.')
-            self[rowindex]._setclr(colindex, clrs)
+            self._owned(rowindex)._setclr(colindex, clrs)
         elif rowindex is None and colindex is None:
             for rowind in range(self._num_rows):
+                row = self._owned(rowind)
                 for colind in range(self._num_cols):
-                    self[rowind]._setclr(colind, clrs)
+                    row._setclr(colind, clrs)
         elif rowindex is None or colindex is None:
             if rowindex is not None:
                 if -self._num_rows > rowindex >= self._num_rows:
                     raise IndexError('Row index out of range.')
+                row = self._owned(rowindex)
                 for colind in range(self._num_cols):
-                    self[rowindex]._setclr(colind, clrs)
+                    row._setclr(colind, clrs)
             elif colindex is not None:
                 if -self._num_cols > colindex >= self._num_cols:
                     raise IndexError('Column index out of range.')
-                for row in self:
-                    row._setclr(colindex, clrs)
+                for rowind in range(self._num_rows):
+                    self._owned(rowind)._setclr(colindex, clrs)
 
     def getColor(self, rowindex, colindex):
         '''
@@ -1117,7 +2250,9 @@ class Table(list):
         '''
         self._check_index(rowindex, colindex)
         # 调用 _RowObj（行）实例的 _getclr 方法获取单元格颜色集合
-        return self[rowindex]._getclr(colindex)
+        row = self._owned(rowindex)
+        self._clr_exposed = True
+        return row._getclr(colindex)
 
     def defaultClr(self, *values):
         '''
@@ -1164,6 +2299,73 @@ class Table(list):
         if alignv:
             self._alignv = alignv
 
+    def setSampling(self, enable=True, *, head=1000, size=1000, seed=None):
+        '''
+        Table 类实例的设置抽样估计列宽方法。
+            1.启用后只测量开头 head 行（含标题行之后的前 head 行）和蓄水池抽样得到的
+            最多 size 行来估计列宽，其余行添加、覆写时不调用 str() 也不测量宽度，直
+            到被输出时才测量，适合行数极多的数据源；
+            2.未入样的宽内容按估计的列宽折行，仍遵守 MAX_COLUMN_WIDTH 列宽上限；为
+            避免未测量的宽字符（如汉字）放不进列宽，启用时列宽至少为 2；
+            3.enable 为 False 时停用抽样，重新测量所有行。
+        :param enable: bool，是否启用抽样估计列宽，默认 True。
+        :param head: int，全部入样的开头行数，默认 1000。
+        :param size: int，蓄水池抽样的样本行数，默认 1000。
+        :param seed: 随机数种子，同 random.Random 的参数，默认 None。
+        :return: None。
+        '''
+        for name, value in (('head', head), ('size', size)):
+            if not isinstance(value, int):
+                raise TypeError(
+                    'Integer parameter <%s> expected, got %s.'
+                    % (name, type(value).__name__)
+                )
+            if value < 0:
+                raise ValueError(
+                    'The value of <%s> cannot be less than 0.' % name
+                )
+        self._check_frozen()
+        self._resample(enable, head, size, seed)
+
+    def _resample(self, enable, head, size, seed):
+        '''
+        按新的抽样设置重新抽样并重建各列宽度计数器，参数已由 setSampling 方法检查。
+        '''
+        if enable:
+            self._sampler = _RowSampler(head, size, seed)
+            # 标题行始终计入，其余行按原顺序重新抽样，最终入样的是开头行和蓄水池中的行
+            body = self[1:]
+            for row_obj in body:
+                self._sampler.offer(row_obj)
+            samples = set(map(id, self._sampler.rows))
+            self[0]._sampled = True
+            for index, row_obj in enumerate(body):
+                row_obj._sampled = index < head or id(row_obj) in samples
+        else:
+            self._sampler = None
+            for row_obj in self:
+                row_obj._sampled = True
+        sampled = [row for row in self if row._sampled]
+        for colind in range(self._num_cols):
+            cap_tally = _WidthTally(row._colcap(colind) for row in sampled)
+            floor_tally = _WidthTally(row._colflr(colind) for row in sampled)
+            self._cap_tallies[colind] = cap_tally
+            self._floor_tallies[colind] = floor_tally
+            self._col_caps[colind] = cap_tally.max
+            self._col_floors[colind] = floor_tally.max
+
+    def setCompact(self, enable=True):
+        '''
+        Table 类实例的设置是否合并颜色控制码方法。
+        启用后输出彩色表格时，只在颜色真正改变时才输出颜色控制码：相邻且颜色相同的单元
+        格（中间的垂直边框线为空或只有空格，且颜色只设置了前景色）共用一对控制码，颜色
+        改变时用一个控制码完成重置和设置。显示效果与不启用时相同，但输出的字节更少，适
+        合通过 SSH 等远程会话输出表格。默认不启用。
+        :param enable: bool，是否启用，默认 True。
+        :return: None。
+        '''
+        self._compact = bool(enable)
+
     def setStyle(self, style):
         '''
         Table 类实例的设置表格边框线风格方法。
@@ -1211,8 +2413,10 @@ class Table(list):
         *,
         color=True,
         header=True,
-        file=sys.stdout,
+        file=None,
         footer=False,
+        chunksize=None,
+        workers=None,
     ):
         '''
         Table 类实例的输出表格方法。
@@ -1224,8 +2428,13 @@ class Table(list):
         输出的表格将不携带任何颜色控制代码（如果你之前已有设置好的颜色，它不会被清除，
         下次你仍可以将 color 参数设置为 True，以输出你之前设定好的彩色表格）。
         :param header: bool，是否输出标题行（严格来说是第一行），默认 True。
-        :param file: TextIOWrapper，Python 文件对象（既可以是标准输出流，也可以是
-        open 返回的 Python 文件对象等）。
+        :param file: 任何有 write 方法的对象（标准输出流、open 返回的 Python 文件对
+        象、io.StringIO 等），默认 None 即调用时的 sys.stdout。
+        :param footer: bool，是否输出脚注，默认 False。
+        :param chunksize: int，攒够多少个字符调用一次 file.write，默认 None 即
+        _CHUNK_SIZE（64K）。
+        :param workers: int，大于 1 时用 workers 个进程并行渲染主体行，见 getText 方
+        法，默认 None（不并行）。
         :return: None。
         '''
         if not isinstance(start, int):
@@ -1234,8 +2443,52 @@ class Table(list):
             raise TypeError(
                 'Type of parameter <stop> should be "int" or "None".'
             )
-        if not isinstance(file, (TextIOWrapper, StdOutputFile, StreamWrapper)):
-            raise TypeError('Type of <file> is not Python file object.')
+        file = _output_file(file, color)
+        if not callable(getattr(file, 'write', None)):
+            raise TypeError('Parameter <file> should have a "write" method.')
+        if chunksize is None:
+            chunksize = _CHUNK_SIZE
+        if not isinstance(chunksize, int):
+            raise TypeError(
+                'Type of parameter <chunksize> should be "int" or "None".'
+            )
+        if chunksize < 1:
+            raise ValueError('The value of <chunksize> should be at least 1.')
+        Table._check_workers(workers)
+        self._output(
+            start, stop, header, footer, color, file, chunksize, workers
+        )
+        # 如果 file 是标准输出流 sys.stdout，则不用关闭文件，直接返回
+        # 当然如果用户在外部将 sys.stdout 赋值为 Python file object，那关闭文件操作
+        # 也是用户应尽的义务
+        # colorama 初始化时会替换 sys.stdout、sys.stderr，原来的标准流同样不能关闭
+        if any(
+            file is stream
+            for stream in (
+                sys.stdout,
+                sys.stderr,
+                sys.__stdout__,
+                sys.__stderr__,
+            )
+        ):
+            return
+        # 只关闭 Python 文件对象，io.StringIO、套接字包装等其他可写对象由调用者管理
+        file_types = (TextIOWrapper, _idle_output_file(), _stream_wrapper())
+        if not isinstance(file, tuple(t for t in file_types if t is not None)):
+            return
+        # 尝试关闭文件，关闭失败不作处理，直接返回
+        try:
+            file.close()
+        except Exception:
+            pass
+
+    def _output(
+        self, start, stop, header, footer, color, file, chunksize, workers
+    ):
+        '''
+        按运行环境选择逐项输出或分块整体输出表格，不关闭 file，参数已由调用者检查，
+        见 show 方法。
+        '''
         # 如果程序运行于 win 平台且非运行于 IDLE 上，则调用逐项输出方法 _out_itemized
         # 来输出，原因：
         # 1. win 平台上用 colorama 模块来在终端上输出彩色表格，如果将表格所有项串成一
@@ -1245,96 +2498,220 @@ class Table(list):
         # 2. 如果运行于 IDLE 上，因 IDLE 不接受前景色背景色代码控制，所以 colors 模块
         # 会反回空字符串代替颜色控制代码，所以不管是否运行于 win 平台上，都没有颜色混乱
         # 的烦恼，所以直接调用整体一次输出方法 _out_overall 来输出就行。
-        if _NT and not run_on_idle:
+        # 3. 不输出颜色时也没有颜色混乱的问题，同样用 _out_overall 分块输出。
+        # 逐项输出时不并行渲染，忽略 workers 参数。
+        if _NT and color and not _on_idle():
             self._out_itemized(start, stop, header, footer, color, file)
         else:
-            self._out_overall(start, stop, header, footer, color, file)
-        # 如果 file 是标准输出流 sys.stdout，则不用关闭文件，直接返回
-        # 当然如果用户在外部将 sys.stdout 赋值为 Python file object，那关闭文件操作
-        # 也是用户应尽的义务
-        if file is sys.stdout:
-            return
-        # 尝试关闭文件，关闭失败不作处理，直接返回
-        try:
-            file.close()
-        except Exception:
-            pass
+            self._out_overall(
+                start, stop, header, footer, color, file, chunksize, workers
+            )
 
-    def _out_overall(self, start, stop, header, footer, color, file):
-        text = self.getText(start, stop, header, footer, color=color)
-        try:
-            file.write(text + _LNSEP)
-            if footer:
-                file.write(self._foot_text + _LNSEP)
-                file.write(self._border['tail'] + _LNSEP)
-            file.flush()
-        except Exception:
-            raise IOError('Failed to write to file or print on terminal.')
+    def _out_overall(
+        self,
+        start,
+        stop,
+        header,
+        footer,
+        color,
+        file,
+        chunksize=_CHUNK_SIZE,
+        workers=None,
+    ):
+        # 逐行生成，攒够 chunksize 个字符再一次性写入，不先把整个表格拼成一个大字符串
+        # 渲染出错时原样抛出，只有写入出错才转换为 IOError，见 _write_lines 函数
+        ctx = self._context(color)
+        key, border = self._refresh(ctx, footer=footer)
+        texts = self._render_pool(start, stop, key, ctx, workers, True)
+        lines = self._iter_full(
+            start, stop, header, footer, ctx, key, border, True, texts
+        )
+        _write_lines(file, lines, chunksize)
+
+    def dump(
+        self,
+        file,
+        start=0,
+        stop=None,
+        *,
+        header=True,
+        footer=False,
+        color=False,
+        encoding='utf-8',
+        errors='strict',
+        chunksize=None,
+        cache=False,
+    ):
+        '''
+        Table 类实例的二进制输出方法，适合将很大的表格导出到文件、管道。
+        表格按"表格行"整行编码为 encoding 编码的字节，攒进一个 bytearray 缓冲区，满
+        chunksize 字节后一次写出，绕过文本文件层逐行编码的开销；边框线和换行符只编码
+        一次。输出内容与 show 方法相同（编码后），不会关闭 file。
+        :param file: int|二进制文件对象，int 表示文件描述符，用 os.write 写入；否则
+        应是 write 方法接受字节串的对象（open(..., 'wb') 返回的文件对象、io.BytesIO、
+        sys.stdout.buffer 等）。
+        :param start: int，要输出的起始行（不包括标题行），默认 0。
+        :param stop: int，要输出的结束行（不包括标题行），默认 None（末尾）。
+        :param header: bool，是否输出标题行，默认 True。
+        :param footer: bool，是否输出脚注，默认 False。
+        :param color: bool，是否携带颜色控制代码，默认 False。
+        :param encoding: str，编码，默认 utf-8。
+        :param errors: str，编码错误处理方式，同 str.encode 的参数，默认 strict。
+        :param chunksize: int，缓冲区攒够多少字节写出一次，默认 None 即 _CHUNK_SIZE。
+        :param cache: bool，是否将新渲染的行的字符串形式存入行缓存，同 iterLines。
+        :return: None。
+        '''
+        if not isinstance(start, int):
+            raise TypeError('Type of parameter <start> should be "int".')
+        if not isinstance(stop, int) and stop is not None:
+            raise TypeError(
+                'Type of parameter <stop> should be "int" or "None".'
+            )
+        if isinstance(file, int):
+            write = partial(_write_fd, file)
+        elif callable(getattr(file, 'write', None)):
+            write = file.write
+        else:
+            raise TypeError(
+                'Parameter <file> should be a file descriptor or have a '
+                '"write" method.'
+            )
+        if chunksize is None:
+            chunksize = _CHUNK_SIZE
+        if not isinstance(chunksize, int):
+            raise TypeError(
+                'Type of parameter <chunksize> should be "int" or "None".'
+            )
+        if chunksize < 1:
+            raise ValueError('The value of <chunksize> should be at least 1.')
+        ctx = self._context(color)
+        chunks = self._iter_encoded(
+            start, stop, header, footer, ctx, encoding, errors, cache
+        )
+        # 渲染、编码出错时原样抛出，只有写入出错才转换为 IOError。缓冲区会被清空重用，
+        # 写出的是不可变的字节串副本，file 可以保留对它的引用（如放入列表、队列）
+        buffer = bytearray()
+        for chunk in chunks:
+            buffer += chunk
+            if len(buffer) >= chunksize:
+                _write_bytes(write, bytes(buffer))
+                buffer.clear()
+        if buffer:
+            _write_bytes(write, bytes(buffer))
+        flush = getattr(file, 'flush', None)
+        if callable(flush):
+            flush()
+
+    def _iter_encoded(
+        self, start, stop, header, footer, ctx, encoding, errors, store
+    ):
+        '''
+        逐块生成已编码的表格字节串，每块是一条边框线或一个完整的"表格行"（含换行符）。
+        ctx 为渲染参数，其余参数见 dump 方法。
+        '''
+        key, border_text = self._refresh(ctx, footer=footer)
+        lnsep = ctx.lnsep.encode(encoding, errors)
+        indices = self._body_range(start, stop)
+        if not header and not indices:
+            # 提示信息及脚注由 _iter_full 方法生成，与 show 方法的输出一致
+            lines = self._iter_full(
+                start, stop, header, footer, ctx, key, border_text, store
+            )
+            for line in lines:
+                yield line.encode(encoding, errors) + lnsep
+            return
+        # 边框线只编码一次
+        border = {
+            name: text.encode(encoding, errors) + lnsep
+            for name, text in border_text.items()
+        }
+        yield border['hat']
+        if header:
+            text = self._rowtext(0, key, ctx, store)
+            yield text.encode(encoding, errors) + lnsep
+            yield border['neck'] if indices else border['shoes']
+        if indices:
+            belt = border['belt'] if border_text['belt'] else None
+            last = len(indices) - 1
+            for num, index in enumerate(indices):
+                text = self._rowtext(index, key, ctx, store)
+                yield text.encode(encoding, errors) + lnsep
+                if belt and num != last:
+                    yield belt
+            yield border['shoes']
+        if footer:
+            yield border['foot']
+            yield border['tail']
 
     def _out_itemized(self, start, stop, header, footer, color, file):
-        global _COLOR
-        if not color:
-            _COLOR = False
-        self.refactorText(footer=footer)
-        hat = self._border['hat']
-        neck = self._border['neck']
-        belt = self._border['belt']
-        shoes = self._border['shoes']
-        pad = self._style.cell_pad
-        headerform = self[0]._form(pad)
-        bodylist = self[1:][start:stop]
+        ctx = self._context(color)
+        key, border = self._refresh(ctx, footer=footer)
+        hat = border['hat']
+        neck = border['neck']
+        belt = border['belt']
+        shoes = border['shoes']
+        lnsep = ctx.lnsep
+        headerform = self[0]._form(ctx, col_wids=key[0])
+        bodylist = [self[i] for i in self._body_range(start, stop)]
         if not header and not bodylist:
             file.write('No table content to print.\n')
             return
-        file.write(hat + _LNSEP)
+        file.write(hat + lnsep)
         if header:
-            for line in headerform:
-                len_line = len(line)
-                file.write(self._style.left_vert)
-                for ind, string in enumerate(line):
-                    file.write(string)
-                    if ind != len_line - 1:
-                        file.write(self._style.center_vert)
-                file.write(self._style.right_vert + _LNSEP)
+            _write_itemized(file, headerform, ctx)
             if bodylist:
-                file.write(neck + _LNSEP)
+                file.write(neck + lnsep)
             else:
-                file.write(shoes + _LNSEP)
+                file.write(shoes + lnsep)
                 if footer:
                     file.write(
-                        ''.join(
-                            (
-                                self._foot_text,
-                                _LNSEP,
-                                self._border['tail'],
-                                _LNSEP,
-                            )
-                        )
+                        ''.join((border['foot'], lnsep, border['tail'], lnsep))
                     )
                 return
         len_body = len(bodylist)
         for index, bodyrow in enumerate(bodylist):
-            rowform = bodyrow._form(pad)
-            for line in rowform:
-                file.write(self._style.left_vert)
-                len_line = len(line)
-                for ind, string in enumerate(line):
-                    file.write(string)
-                    if ind != len_line - 1:
-                        file.write(self._style.center_vert)
-                file.write(self._style.right_vert + _LNSEP)
+            _write_itemized(file, bodyrow._form(ctx, col_wids=key[0]), ctx)
             if (index != len_body - 1) and belt:
-                file.write(belt + _LNSEP)
-        file.write(shoes + _LNSEP)
+                file.write(belt + lnsep)
+        file.write(shoes + lnsep)
         if footer:
-            file.write(
-                ''.join(
-                    (self._foot_text, _LNSEP, self._border['tail'], _LNSEP)
-                )
-            )
-        _COLOR = True
+            file.write(''.join((border['foot'], lnsep, border['tail'], lnsep)))
 
     def refactorText(self, footer=False):
+        '''
+        重构整个表格所有"行"的字符串形式，存入 rowTexts 属性。
+        :param footer: bool，是否生成带脚注的表格边框线。
+        '''
+        ctx = self._context(True)
+        key, _ = self._refresh(ctx, footer=footer)
+        self.rowTexts.clear()
+        for index in range(len(self)):
+            self.rowTexts.append(self._rowtext(index, key, ctx))
+
+    def _context(self, color):
+        '''
+        按表格当前的风格和设置生成渲染参数。
+        :param color: bool，是否携带颜色控制代码。
+        :return: _RenderContext，渲染参数。
+        '''
+        return _RenderContext(
+            bool(color),
+            self._style.cell_pad,
+            self._style.left_vert,
+            self._style.center_vert,
+            self._style.right_vert,
+            self._compact,
+        )
+
+    def _refresh(self, ctx, footer=False):
+        '''
+        根据列宽上、下限和固定列宽刷新最终列宽，重新生成边框线和脚注文本。
+        只涉及列元数据，耗时与表格行数无关。
+        :param ctx: _RenderContext，渲染参数。
+        :param footer: bool，是否生成带脚注的表格边框线。
+        :return: tuple，(渲染参数键, 边框线字典)，渲染参数键传给 _rowtext 方法，
+        边框线字典的键为 hat、neck、belt、shoes、tail、foot（脚注文本）。
+        '''
         self._col_wids_refresh()
         widths = [
             wid + _str_wid(self._style.cell_pad) * 2 for wid in self._col_wids
@@ -1390,12 +2767,16 @@ class Table(list):
         foot_rowobj = _RowObj(
             (foot_ln,), [foot_width - padding_width], 0, 'l', 't', {},
         )
-        self._foot_text = foot_rowobj._getrowtext(
-            self._style.left_vert,
-            self._style.center_vert,
-            self._style.right_vert,
-            self._style.cell_pad,
+        # 脚注没有颜色，不需要合并颜色控制码
+        foot_ctx = _RenderContext(
+            ctx.color,
+            ctx.padding,
+            ctx.left_vert,
+            ctx.center_vert,
+            ctx.right_vert,
+            lnsep=ctx.lnsep,
         )
+        foot = foot_rowobj._getrowtext(foot_ctx)
         tail = ''.join(
             (
                 self._style.bottom_left,
@@ -1403,48 +2784,331 @@ class Table(list):
                 self._style.bottom_right,
             )
         )
-        self._border['hat'] = hat
-        self._border['neck'] = neck
-        self._border['belt'] = belt
-        self._border['shoes'] = shoes
-        self._border['tail'] = tail
-        self.rowTexts.clear()
-        for row_obj in self:
-            self.rowTexts.append(
-                row_obj._getrowtext(
-                    self._style.left_vert,
-                    self._style.center_vert,
-                    self._style.right_vert,
-                    self._style.cell_pad,
+        # 生成新的字典而不是修改旧字典，其他线程正在使用的边框线不受影响
+        border = dict(
+            hat=hat, neck=neck, belt=belt, shoes=shoes, tail=tail, foot=foot
+        )
+        self._border = border
+        key = (tuple(self._col_wids), ctx.key)
+        # 渲染参数没有变化则沿用上次的键对象，未改变的行直接取缓存文本
+        last_key = self._text_key
+        if key == last_key:
+            return last_key, border
+        self._text_key = key
+        return key, border
+
+    def _rowtext(self, index, key, ctx, store=True):
+        '''
+        获取第 index 行的字符串形式（行未改变且渲染参数键相同则直接取缓存）。
+        :param index: int，行索引。
+        :param key: tuple，_refresh 方法返回的渲染参数键。
+        :param ctx: _RenderContext，渲染参数。
+        :param store: bool，是否将新渲染的字符串形式存入行的缓存。
+        :return: str，行的字符串形式。
+        '''
+        return self[index]._getrowtext(ctx, key, store)
+
+    def pages(self, page_rows=None):
+        '''
+        Table 类实例的分页方法。
+            1.page_rows 为 None 时按终端高度分页：计入折行、setRowHeight 设置的行高
+            等造成的多行"表格行"，每页连同标题行、边框线正好放得下一屏，每页至少一行；
+            2.page_rows 为正整数时每页固定 page_rows 行；
+            3.按终端高度分页的结果会被缓存，供 showPage 方法使用，行数、列宽或终端高
+            度改变后 showPage 会自动重新分页。
+        :param page_rows: int，每页行数（不包括标题行），默认 None。
+        :return: list[tuple[int, int]]，每页的 (start, stop)，可直接传给 show、
+        getText 等方法；没有主体行时返回只含 (0, 0) 的列表（只有标题行的一页）。
+        '''
+        if page_rows is not None:
+            if not isinstance(page_rows, int):
+                raise TypeError(
+                    'Type of parameter <page_rows> should be "int" or "None".'
                 )
+            if page_rows < 1:
+                raise ValueError(
+                    'The value of <page_rows> should be at least 1.'
+                )
+            num_body = self._num_rows - 1
+            return [
+                (start, min(start + page_rows, num_body))
+                for start in range(0, num_body, page_rows)
+            ] or [(0, 0)]
+        key, budget, belt = self._page_params()
+        bounds, start, used = list(), 0, 0
+        for index in range(1, len(self)):
+            height = self[index]._lines(key)
+            if index - 1 == start:
+                used = height
+            elif used + belt + height > budget:
+                bounds.append((start, index - 1))
+                start, used = index - 1, height
+            else:
+                used += belt + height
+        bounds.append((start, len(self) - 1))
+        self._page_index = (key, budget, len(self), bounds)
+        return bounds
+
+    def showPage(self, n, page_rows=None, *, color=True, file=None):
+        '''
+        Table 类实例的输出指定页方法，每页都输出标题行和完整的边框线。
+        只渲染该页的行：page_rows 为正整数时直接算出该页的行范围；为 None 时使用
+        pages 方法缓存的按终端高度的分页结果，所以输出第 N 页与输出第 1 页的耗时相当。
+        :param n: int，页码，从 0 开始，可以是负数（-1 表示最后一页）。
+        :param page_rows: int，每页行数，默认 None 即按终端高度分页，见 pages 方法。
+        :param color: bool，是否输出彩色表格，默认 True。
+        :param file: 同 show 方法的 file 参数，但输出后不会关闭 file，可以连续输出多页
+        到同一个文件。
+        :return: None。
+        '''
+        if not isinstance(n, int):
+            raise TypeError(
+                'Integer parameter <n> expected, got %s.' % type(n).__name__
             )
+        file = _output_file(file, color)
+        if not callable(getattr(file, 'write', None)):
+            raise TypeError('Parameter <file> should have a "write" method.')
+        if page_rows is not None:
+            bounds = self.pages(page_rows)
+        else:
+            key, budget, belt = self._page_params()
+            index = self._page_index
+            if index is None or index[:3] != (key, budget, len(self)):
+                bounds = self.pages()
+            else:
+                bounds = index[3]
+                # 行数、列宽未变但行内容可能已改变，只复核本页的行是否仍放得下
+                if not self._page_fits(bounds, n, key, budget, belt):
+                    bounds = self.pages()
+        if not -len(bounds) <= n < len(bounds):
+            raise IndexError('Page index out of range.')
+        start, stop = bounds[n]
+        self._output(start, stop, True, False, color, file, _CHUNK_SIZE, None)
+
+    def _page_fits(self, bounds, n, key, budget, belt):
+        '''
+        复核缓存的分页结果中第 n 页的行是否仍放得下一屏，只计算该页的行。
+        :return: bool，放得下（或该页只有一行、页码超出范围）为 True。
+        '''
+        if not -len(bounds) <= n < len(bounds):
+            return True
+        indices = self._body_range(*bounds[n])
+        if len(indices) < 2:
+            return True
+        used = sum(self[i]._lines(key) for i in indices)
+        return used + belt * (len(indices) - 1) <= budget
+
+    def _page_params(self):
+        '''
+        按终端高度分页的参数。
+        :return: tuple，(列宽元组, 每页主体行可用的文本行数, 每条 belt 分隔线的行数)。
+        '''
+        _, border = self._refresh(self._context(True))
+        key = tuple(self._col_wids)
+        # 列宽不变则沿用同一个元组对象，各行缓存的文本行数继续有效
+        if self._page_index is not None and key == self._page_index[0]:
+            key = self._page_index[0]
+        # shutil 模块只在按终端高度分页时用到，推迟导入以缩短导入本模块的耗时
+        from shutil import get_terminal_size
+
+        # 终端高度减去 hat、neck、shoes 边框线、标题行及留给提示符的一行
+        budget = get_terminal_size().lines - 4 - self[0]._lines(key)
+        belt = 1 if border['belt'] else 0
+        return key, max(budget, 1), belt
+
+    def _body_range(self, start, stop):
+        '''
+        将 start、stop（不包括标题行的行索引，用法同列表切片）换算为表格行索引范围。
+        :return: range，要输出的主体行在 self 中的索引。
+        '''
+        return range(1, len(self))[start:stop]
 
     def getText(
-        self, start=0, stop=None, header=True, footer=False, color=False
+        self,
+        start=0,
+        stop=None,
+        header=True,
+        footer=False,
+        color=False,
+        *,
+        workers=None,
     ):
-        global _COLOR
-        if not color:
-            _COLOR = False
-        self.refactorText(footer=footer)
-        _COLOR = True
-        hat = self._border['hat']
-        neck = self._border['neck']
-        belt = self._border['belt']
-        shoes = self._border['shoes']
-        if belt:
-            belt = ''.join((_LNSEP, belt, _LNSEP))
-        else:
-            belt = _LNSEP
-        body = belt.join(self.rowTexts[1:][start:stop])
-        if not header:
-            if not body:
-                return 'No table content to print.\n'
-            group = (hat, body, shoes)
-        elif not body:
-            group = (hat, self.rowTexts[0], shoes)
+        '''
+        Table 类实例的获取表格文本方法，参数 start、stop、header、color 与 iterLines
+        方法相同，footer 为 True 时生成带脚注的表格边框线（不含脚注文本）。
+        :param workers: int，大于 1 时用 workers 个进程并行渲染主体行：冻结列宽、渲
+        染参数和颜色控制码后将未缓存的主体行分块交给进程池格式化，再按原顺序拼接，结果
+        与不并行时完全相同。只适合很大的表格，进程启动和数据传输都有开销。默认 None（
+        不并行）。
+        :return: str，表格文本。
+        '''
+        Table._check_workers(workers)
+        ctx = self._context(color)
+        key, border = self._refresh(ctx, footer=footer)
+        texts = self._render_pool(start, stop, key, ctx, workers, True)
+        lines = list(
+            self._iter_lines(
+                start, stop, header, ctx, key, border, True, texts
+            )
+        )
+        if not lines:
+            return 'No table content to print.\n'
+        return ctx.lnsep.join(lines)
+
+    @staticmethod
+    def _check_workers(workers):
+        if workers is None:
+            return
+        if not isinstance(workers, int):
+            raise TypeError(
+                'Integer parameter <workers> expected, got %s.'
+                % type(workers).__name__
+            )
+        if workers < 1:
+            raise ValueError('The value of <workers> should be at least 1.')
+
+    def _render_pool(self, start, stop, key, ctx, workers, store):
+        '''
+        用进程池并行渲染 start 至 stop 之间未缓存的主体行。
+        列宽、渲染参数和各颜色集合的颜色控制码都在本进程冻结后随各块一起传给子进程，
+        子进程只格式化单元格字符串，不重新检测终端、IDLE 等，所以渲染结果与本进程相同。
+        :param key: tuple，_refresh 方法返回的渲染参数键。
+        :param ctx: _RenderContext，渲染参数。
+        :param workers: int|None，进程数，不大于 1 时不并行。
+        :param store: bool，是否将渲染结果存入行缓存。
+        :return: dict|None，{行索引: 行的字符串形式}，不并行时为 None。
+        '''
+        if workers is None or workers < 2:
+            return None
+        pending, payloads, fmts = list(), list(), set()
+        for index in self._body_range(start, stop):
+            row = self[index]
+            cached = row._text
+            if (
+                cached is not None
+                and cached[0] is key
+                and not row._clr_exposed
+            ):
+                continue
+            if row._strs is None:
+                row._measure()
+            # 默认格式是驻留的元组，可以直接放入集合；格式覆盖中可能有可变的颜色集合
+            fmts.add(row._default)
+            if row._overrides:
+                fmts.update(
+                    fmt[:2] + (frozenset(fmt[2]),)
+                    for fmt in row._overrides.values()
+                )
+            pending.append((index, row))
+            payloads.append(
+                (row._strs, row._row_hit, row._default, row._overrides)
+            )
+        if not pending:
+            return dict()
+        affixes = dict()
+        if ctx.color:
+            affixes = {fmt[2]: _color_affix(fmt[2]) for fmt in fmts if fmt[2]}
+        render = partial(_render_chunk, ctx, list(key[0]), affixes)
+        # 每个进程平均分到若干块，块太大时各进程负载不均，太小则传输开销大
+        size = -(-len(payloads) // (workers * 4))
+        chunks = [
+            payloads[i : i + size] for i in range(0, len(payloads), size)
+        ]
+        # 只在并行渲染时用到，推迟导入以缩短导入本模块的耗时
+        from concurrent.futures import ProcessPoolExecutor
+
+        with ProcessPoolExecutor(max_workers=workers) as executor:
+            results = [
+                text
+                for texts in executor.map(render, chunks)
+                for text in texts
+            ]
+        rendered = dict()
+        for (index, row), text in zip(pending, results):
+            if store:
+                row._keep(key, text)
+            rendered[index] = text
+        return rendered
+
+    def iterLines(
+        self,
+        start=0,
+        stop=None,
+        header=True,
+        footer=False,
+        color=False,
+        *,
+        cache=False,
+    ):
+        '''
+        Table 类实例的逐行生成表格文本方法（生成器）。
+        每次生成表格的一个文本行（边框线或单元格内容行，不含换行符），占用内存与表格大
+        小无关，适合将很大的表格输出到文件、管道等。
+        :param start: int，要输出的起始行（不包括标题行），默认 0。
+        :param stop: int，要输出的结束行（不包括标题行），默认 None（末尾）。
+        :param header: bool，是否输出标题行，默认 True。
+        :param footer: bool，是否输出脚注，默认 False。
+        :param color: bool，是否携带颜色控制代码，默认 False。
+        :param cache: bool，是否将新渲染的行的字符串形式存入行缓存，默认 False（不占用
+        额外内存），需要反复输出同一表格时可设为 True。
+        :return: Generator[str]，表格的文本行。
+        '''
+        ctx = self._context(color)
+        key, border = self._refresh(ctx, footer=footer)
+        yield from self._iter_full(
+            start, stop, header, footer, ctx, key, border, cache
+        )
+
+    def _iter_full(
+        self, start, stop, header, footer, ctx, key, border, store, texts=None
+    ):
+        '''
+        逐行生成完整的表格文本行（含脚注），参数见 iterLines、_iter_lines 方法。
+        '''
+        lines = self._iter_lines(
+            start, stop, header, ctx, key, border, store, texts
+        )
+        first = next(lines, None)
+        if first is None:
+            # 与 show 方法原有输出一致：提示信息后跟一个空行
+            yield 'No table content to print.'
+            yield ''
         else:
-            group = (hat, self.rowTexts[0], neck, body, shoes)
-        return _LNSEP.join(group)
+            yield first
+            yield from lines
+        if footer:
+            yield from border['foot'].split(ctx.lnsep)
+            yield border['tail']
+
+    def _iter_lines(
+        self, start, stop, header, ctx, key, border, store, texts=None
+    ):
+        '''
+        逐行生成表格（不含脚注）的文本行，没有任何内容可输出时不生成任何文本行。
+        ctx 为渲染参数，key、border 为 _refresh 方法的返回值，store 即 iterLines 的
+        cache 参数，texts 为 _render_pool 方法已并行渲染的行 {行索引: 字符串形式}，
+        其余行照常渲染，其余参数见 iterLines 方法。
+        '''
+        lnsep = ctx.lnsep
+        indices = self._body_range(start, stop)
+        if not header and not indices:
+            return
+        yield border['hat']
+        if header:
+            yield from self._rowtext(0, key, ctx, store).split(lnsep)
+            yield border['neck'] if indices else border['shoes']
+            if not indices:
+                return
+        belt = border['belt']
+        last = len(indices) - 1
+        for num, index in enumerate(indices):
+            text = texts.get(index) if texts else None
+            if text is None:
+                text = self._rowtext(index, key, ctx, store)
+            yield from text.split(lnsep)
+            if belt and num != last:
+                yield belt
+        yield border['shoes']
 
     def setFoot(self, footnotes):
         '''
@@ -1473,9 +3137,14 @@ class Table(list):
         return self._foot_orign
 
     def _col_wids_refresh(self):
-        self._col_wids.clear()
+        # 先算出新列宽再整体替换列宽列表的内容，不出现列宽列表被清空的中间状态
+        col_wids = list()
         final_width = 1
+        sampled = self._sampler is not None
         for ind, width in enumerate(self._col_floors):
+            # 抽样估计列宽时未入样的单元格可能含有宽字符，列宽下限至少为最大字符宽度
+            if sampled and width < _MAX_CHR_WID:
+                width = _MAX_CHR_WID
             if self._col_fixeds[ind] != 0 and self._col_fixeds[ind] < width:
                 final_width = width
             elif self._col_fixeds[ind] == 0:
@@ -1487,143 +3156,1488 @@ class Table(list):
                 )
             else:
                 final_width = self._col_fixeds[ind]
-            self._col_wids.append(final_width)
+            # 抽样时即使 MAX_COLUMN_WIDTH 小于列宽下限，列宽也不小于下限；不抽样时与
+            # 原来一样，由 MAX_COLUMN_WIDTH 截断
+            col_wids.append(
+                max(final_width, width) if sampled else final_width
+            )
+        self._col_wids[:] = col_wids
 
-    def _find_cap(self, colindex):
+    def _count_in(self, row, colindex):
         '''
-        查找指定列的最大宽度值并返回该值。
+        将行 row 中指定列单元格的宽度计入该列宽度计数器，并更新该列的宽度上、下限。
+        :param row: _RowObj，表格中的行。
         :param colindex: 指定列的索引值。
-        :return: int: 该列的最大宽度值。
         '''
-        return max(row._colcap(colindex) for row in self)
+        cap_tally = self._cap_tallies[colindex]
+        floor_tally = self._floor_tallies[colindex]
+        cap_tally.add(row._colcap(colindex))
+        floor_tally.add(row._colflr(colindex))
+        self._col_caps[colindex] = cap_tally.max
+        self._col_floors[colindex] = floor_tally.max
 
-    def _find_floor(self, colindex):
+    def _count_out(self, row, colindex):
         '''
-        查找指定列的宽度下限并返回该值。
+        从该列宽度计数器中移除行 row 中指定列单元格的宽度，并更新该列的宽度上、下限。
+        :param row: _RowObj，表格中的行。
         :param colindex: 指定列的索引值。
-        :return: int: 该列的宽度下限。
         '''
-        return max(row._colflr(colindex) for row in self)
+        cap_tally = self._cap_tallies[colindex]
+        floor_tally = self._floor_tallies[colindex]
+        cap, floor = row._colcap(colindex), row._colflr(colindex)
+        if cap in cap_tally and floor in floor_tally:
+            cap_tally.remove(cap)
+            floor_tally.remove(floor)
+        else:
+            # 单元格绕过表格方法被直接覆写了（例如 table[1][0] = value），单元格缓存
+            # 已是新宽度，计数对不上，只能重新统计该列除 row 以外所有单元格的宽度
+            cap_tally, floor_tally = self._recount(colindex, row)
+            self._cap_tallies[colindex] = cap_tally
+            self._floor_tallies[colindex] = floor_tally
+        self._col_caps[colindex] = cap_tally.max
+        self._col_floors[colindex] = floor_tally.max
 
+    def _recount(self, colindex, row):
+        '''
+        重新统计指定列中除行 row 以外所有计入列宽的单元格的宽度。
+        :param colindex: 指定列的索引值。
+        :param row: _RowObj|None，不统计的行，None 则统计整列。
+        :return: tuple，(宽度上限计数器, 宽度下限计数器)。
+        '''
+        others = [r for r in self if r._sampled and r is not row]
+        return (
+            _WidthTally(r._colcap(colindex) for r in others),
+            _WidthTally(r._colflr(colindex) for r in others),
+        )
 
-def _items_to_str(iterable, num=None):
-    '''将可迭代对象里的元素转换成str并返回包含这些元素的列表。'''
-    it = isinstance(iterable, Iterator)
-    gt = isinstance(iterable, Generator)
-    if (num is None) or not (it or gt):
-        return [str(i) for i in iterable]
-    strings = list()
-    for _ in range(num):
-        try:
-            strings.append(str(next(iterable)))
-        except StopIteration:
-            break
-    return strings
+    def _admit(self, row):
+        '''
+        将新行 row 各单元格的宽度计入各列宽度计数器；抽样估计列宽时只计入入样的行，
+        同时移除被挤出蓄水池的样本行的宽度。
+        :param row: _RowObj，刚添加到表格中的行。
+        '''
+        if self._sampler is not None:
+            row._sampled, evicted = self._sampler.offer(row)
+            if evicted is not None:
+                evicted._sampled = False
+                for colind in range(self._num_cols):
+                    self._count_out(evicted, colind)
+            if not row._sampled:
+                return
+        for colind in range(self._num_cols):
+            self._count_in(row, colind)
+
+    def _write(self, row, colindex, value):
+        '''
+        覆写行 row 中指定列的单元格，同时更新该列的宽度计数器。
+        :param row: _RowObj，表格中的行。
+        :param colindex: 指定列的索引值。
+        :param value: any，要写入的值。
+        '''
+        if not row._sampled:
+            row[colindex] = value
+            return
+        self._count_out(row, colindex)
+        row[colindex] = value
+        self._count_in(row, colindex)
 
 
-def _chr_wid(char):
+class _Column(object):
     '''
-    根据字符char的unicode码判断该字符的宽度并返回宽度值。
-    :param char: str，给定的字符。
-    :return: int，字符的宽度（判断并不十分准确，可能有错）。
+    ColumnTable 的列：同一列各单元格的元素、字符串形式、显示宽度、最大单个字符宽度和
+    格式各存于一个连续的列表中，按行索引对应。
     '''
-    code = ord(char)
-    # 英文字母、符号：0021-007E
-    if 0x0021 <= code <= 0x007E:
-        return 1
-    # 韩文字母：1100-11FF
-    if 0x1100 <= code <= 0x11FF:
-        return 2
-    # 盲文符号：2800-28FF
-    if 0x2800 <= code <= 0x28FF:
-        return 1
-    # CJK部首补充：2E80-2EFF
-    # 康熙部首：2F00-2FDF
-    if 0x2E80 <= code <= 0x2FDF:
-        return 2
-    # 注音符号：3100-312F
-    # 日文片假名：30A0-30FF
-    # 日文平假名：3040-309F
-    # CJK标点符号：3000-303F
-    # 汉字结构描述符：2FF0-2FFF
-    if 0x2FF0 <= code <= 0x312F:
-        return 2
-    # 韩文兼容字母：3130-318F
-    if 0x3130 <= code <= 0x318F:
-        return 2
-    # CJK笔划：31C0-31EF
-    # 日文片假名拼音扩展：31F0-31FF
-    if 0x31C0 <= code <= 0x31FF:
-        return 2
-    # CJK字母及月份：3200-32FF
-    if 0x3200 <= code <= 0x3247:
-        return 2
-    if 0x3248 <= code <= 0x324F:
-        return 1
-    if 0x3250 <= code <= 0x32FF:
-        return 2
-    # CJK特殊符号：3300-33FF
-    if 0x3300 <= code <= 0x33FF:
-        return 2
-    # 扩展A	6582字	3400-4DB5
-    if 0x3400 <= code <= 0x4DB5:
-        return 2
-    if 0x4DC0 <= code <= 0x4DFF:
-        return 2
-    # 基本CJK文字
-    if 0x4E00 <= code <= 0x9FFF:
-        return 2
-    # 彝文音节：A000-A48F
-    if 0xA000 <= code <= 0xA48F:
-        return 2
-    # 彝文部首：A490-A4CF
-    if 0xA490 <= code <= 0xA4CF:
-        return 2
-    # 韩文拼音：AC00-D7AF
-    if 0xAC00 <= code <= 0xD7AF:
-        return 2
-    # 兼容汉字	477字	F900-FAFF
-    if 0xF900 <= code <= 0xFAFF:
-        return 2
-    # 全角ASCII、全角中英文标点
-    # 半宽片假名、半宽平假名、半宽韩文字母：FF00-FFEF
-    if 0xFF00 <= code <= 0xFF60:
-        return 2
-    if 0xFF61 <= code <= 0xFFDF:
-        return 1
-    if 0xFFE0 <= code <= 0xFFE6:
-        return 2
-    if 0xFFE7 <= code <= 0xFFEF:
-        return 1
-    # 太玄经符号：1D300-1D35F
-    if 0x1D300 <= code <= 0x1D35F:
-        return 2
+
+    __slots__ = ('values', 'strs', 'wids', 'flrs', 'fmts')
+
+    def __init__(self, values=()):
+        '''
+        初始化方法。
+        :param values: Iterable，该列各单元格的元素（含标题行）。
+        '''
+        self.values = list()
+        self.strs = list()
+        self.wids = list()
+        self.flrs = list()
+        # 单元格格式覆盖列表，与 values 等长，元素为格式元组或 None（使用所在行的默认
+        # 格式）；整列都没有格式覆盖时为 None，不占用内存
+        self.fmts = None
+        self.insert(0, list(values))
+
+    def insert(self, index, values, measured=None):
+        '''
+        在 index 处插入多个单元格并测量，插入位置的规则与 list.insert 相同。
+        :param index: int，插入位置索引。
+        :param values: list，要插入的元素。
+        :param measured: tuple，调用者已测量好的结果，同 _measure_column 函数的返回
+        值，默认 None（在此测量）。
+        :return: tuple，(新单元格的显示宽度, 新单元格的最大单个字符宽度)。
+        '''
+        if not values:
+            return (), ()
+        strs, wids, flrs = measured or _measure_column(values)
+        self.values[index:index] = values
+        self.strs[index:index] = strs
+        self.wids[index:index] = wids
+        self.flrs[index:index] = flrs
+        if self.fmts is not None:
+            self.fmts[index:index] = [None] * len(values)
+        return wids, flrs
+
+    def pop(self, index):
+        '''
+        删除 index 处的单元格。
+        :param index: int，行索引。
+        :return: tuple，(元素, 显示宽度, 最大单个字符宽度)。
+        '''
+        del self.strs[index]
+        if self.fmts is not None:
+            del self.fmts[index]
+        return (
+            self.values.pop(index),
+            self.wids.pop(index),
+            self.flrs.pop(index),
+        )
+
+    def copy(self):
+        '''
+        复制该列，各列表都复制一份，已交给外部的可变颜色集合也复制一份。
+        :return: _Column，新的列。
+        '''
+        column = _Column()
+        column.values = list(self.values)
+        column.strs = list(self.strs)
+        column.wids = list(self.wids)
+        column.flrs = list(self.flrs)
+        if self.fmts is not None:
+            column.fmts = [_fmt_copy(fmt) for fmt in self.fmts]
+        return column
+
+    def setfmt(self, index, fmt):
+        '''
+        设置 index 处单元格的格式覆盖，fmt 为 None 表示使用所在行的默认格式。
+        :param index: int，行索引。
+        :param fmt: tuple|None，格式元组。
+        '''
+        if self.fmts is None:
+            if fmt is None:
+                return
+            self.fmts = [None] * len(self.values)
+        self.fmts[index] = fmt
+
+
+class _ColumnRow(_RowObj):
+    '''
+    ColumnTable 的"行"视图：按行索引从各列取出单元格元素、测量结果和格式，生成一个
+    临时的 _RowObj；对它的覆写单元格、设置格式、设置行高等操作会同时写回各列。
+    只在渲染、按行操作时临时生成，表格增删行后旧的视图不再对应原来的行，不应长期持有。
+    '''
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index):
+        '''
+        初始化方法。
+        :param table: ColumnTable，所属表格。
+        :param index: int，非负行索引。
+        '''
+        columns = table._columns
+        alignh, alignv, fbgc = table._row_fmts[index]
+        super().__init__(
+            [column.values[index] for column in columns],
+            table._col_wids,
+            table._row_hits[index],
+            alignh,
+            alignv,
+            fbgc,
+        )
+        self._table = table
+        self._index = index
+        overrides = dict()
+        for colind, column in enumerate(columns):
+            if column.fmts is None or column.fmts[index] is None:
+                continue
+            overrides[colind] = fmt = column.fmts[index]
+            # 颜色集合已通过 getColor 交给外部，与 _RowObj 一样每次都重新渲染
+            if isinstance(fmt[2], set):
+                self._clr_exposed = True
+        self._overrides = overrides or None
+        # 单元格缓存直接取自各列，不再测量
+        self._strs = [column.strs[index] for column in columns]
+        self._wids = [column.wids[index] for column in columns]
+        self._flrs = [column.flrs[index] for column in columns]
+        self._text = table._texts[index]
+
+    def __setitem__(self, index, value):
+        '''
+        覆写单元格，同时写回所在列。
+        '''
+        index = self._colindex(index)
+        super().__setitem__(index, value)
+        column = self._table._columns[index]
+        column.values[self._index] = value
+        column.strs[self._index] = self._strs[index]
+        column.wids[self._index] = self._wids[index]
+        column.flrs[self._index] = self._flrs[index]
+        self._table._texts[self._index] = None
+
+    def _override(self, index, fmt):
+        super()._override(index, fmt)
+        fmt = None if fmt is self._default else fmt
+        self._table._columns[index].setfmt(self._index, fmt)
+        self._table._texts[self._index] = None
+
+    def _height(self, height):
+        super()._height(height)
+        self._table._row_hits[self._index] = height
+        self._table._texts[self._index] = None
+
+    def _keep(self, key, text):
+        super()._keep(key, text)
+        # 渲染结果存回表格的行文本缓存，颜色集合已交给外部的行每次都重新渲染，不存
+        if not self._clr_exposed:
+            self._table._texts[self._index] = self._text
+
+
+def _blocked_list_method(name):
+    '''
+    生成 _RowViews 中禁用的 list 方法，调用时触发 TypeError 异常。
+    :param name: str，list 方法名。
+    :return: function，方法。
+    '''
+
+    def method(self, *args, **kwargs):
+        raise TypeError(
+            '%s does not support list method "%s", use Table methods '
+            '(addRow, delRow, writeCell, etc.) instead.'
+            % (type(self).__name__, name)
+        )
+
+    method.__name__ = name
+    return method
+
+
+class _RowViews(object):
+    '''
+    按行索引临时生成"行"视图的表格（ColumnTable 等）的比较、成员检测、反向遍历等
+    方法。这些表格继承自 list，但各行不保存在列表本身中，list 的这些方法会得到错误的
+    结果，所以改为通过 __len__、__iter__、__getitem__ 逐行处理，结果与 Table 相同；
+    直接增删、替换、重排列表元素的 list 方法则触发 TypeError 异常，增删行、覆写单元
+    格应使用 addRow、delRow、writeCell 等方法。
+    '''
+
+    # 与 list 一样不可哈希
+    __hash__ = None
+
+    append = _blocked_list_method('append')
+    extend = _blocked_list_method('extend')
+    insert = _blocked_list_method('insert')
+    pop = _blocked_list_method('pop')
+    remove = _blocked_list_method('remove')
+    clear = _blocked_list_method('clear')
+    sort = _blocked_list_method('sort')
+    reverse = _blocked_list_method('reverse')
+    __setitem__ = _blocked_list_method('__setitem__')
+    __delitem__ = _blocked_list_method('__delitem__')
+    __iadd__ = _blocked_list_method('__iadd__')
+    __imul__ = _blocked_list_method('__imul__')
+
+    def __eq__(self, other):
+        if not isinstance(other, list):
+            return NotImplemented
+        if len(self) != len(other):
+            return False
+        return all(row == other_row for row, other_row in zip(self, other))
+
+    def __ne__(self, other):
+        equal = self.__eq__(other)
+        return equal if equal is NotImplemented else not equal
+
+    def __contains__(self, value):
+        return any(row is value or row == value for row in self)
+
+    def __reversed__(self):
+        for index in range(len(self) - 1, -1, -1):
+            yield self[index]
+
+    def count(self, value):
+        return sum(1 for row in self if row is value or row == value)
+
+    def index(self, value, start=0, stop=sys.maxsize):
+        start, stop, _ = slice(start, stop).indices(len(self))
+        for index in range(start, stop):
+            row = self[index]
+            if row is value or row == value:
+                return index
+        raise ValueError('%r is not in list' % (value,))
+
+    def copy(self):
+        return list(self)
+
+
+class ColumnTable(_RowViews, Table):
+    '''
+    按列存储的表格类，继承自 Table，公共方法与 Table 相同。
+    每列的单元格元素、测量结果和格式各存于一个连续的列表中（见 _Column 类），增删列、
+    获取列、统计列宽只涉及该列自身，不必逐行处理；"行"只在渲染、按行操作时由
+    _ColumnRow 临时生成。列宽总是整列测量，setSampling 方法不做任何事。
+    '''
+
+    def __init__(
+        self,
+        header,
+        *,
+        alignh='l',
+        alignv='t',
+        rowfixed=0,
+        colfixed=0,
+        fbgc=None,
+        fill='',
+        style=None,
+    ):
+        '''
+        初始化方法，参数与 Table 类相同。
+        '''
+        super().__init__(
+            header,
+            alignh=alignh,
+            alignv=alignv,
+            rowfixed=rowfixed,
+            colfixed=colfixed,
+            fbgc=fbgc,
+            style=style,
+            fill=fill,
+        )
+        # 父类初始化时添加的首行转存到各列，本类实例作为列表本身不保存任何行
+        head_row = list.pop(self)
+        # 各列，list[_Column]
+        self._columns = [_Column((value,)) for value in head_row]
+        # 各行的默认格式元组、行高、已渲染的文本缓存 (渲染参数键, 文本)，按行索引对应
+        self._row_fmts = [head_row._default]
+        self._row_hits = [head_row._row_hit]
+        self._texts = [None]
+
+    def __len__(self):
+        return self._num_rows
+
+    def __iter__(self):
+        for index in range(self._num_rows):
+            yield _ColumnRow(self, index)
+
+    def __getitem__(self, index):
+        '''
+        按行索引生成"行"视图，切片则生成视图列表。
+        '''
+        if isinstance(index, slice):
+            return [
+                _ColumnRow(self, i)
+                for i in range(*index.indices(self._num_rows))
+            ]
+        if index < 0:
+            index += self._num_rows
+        if not 0 <= index < self._num_rows:
+            raise IndexError('Row index out of range.')
+        return _ColumnRow(self, index)
+
+    def snapshot(self):
+        '''
+        ColumnTable 类实例的快照方法，用法见 Table.snapshot 方法。
+        各列的数据存于连续的列表中，增删行时原地修改，所以快照复制各列的列表（只复制
+        元素的引用），耗时与单元格数成正比。
+        '''
+        snap = super().snapshot()
+        snap._columns = [column.copy() for column in self._columns]
+        snap._row_fmts = list(self._row_fmts)
+        snap._row_hits = list(self._row_hits)
+        snap._texts = list(self._texts)
+        return snap
+
+    def _owned(self, index):
+        # 各列的数据不与快照共用，直接修改
+        self._check_frozen()
+        return self[index]
+
+    def _rowtext(self, index, key, ctx, store=True):
+        # 行文本缓存有效时直接返回，不必生成"行"视图
+        cached = self._texts[index]
+        if cached is not None and cached[0] is key:
+            return cached[1]
+        return _ColumnRow(self, index)._getrowtext(ctx, key, store)
+
+    def _insert_column(self, colindex, column):
+        num_rows = self._num_rows
+        values = column[:num_rows]
+        values.extend([self._filler] * (num_rows - len(values)))
+        new_column = _Column(values)
+        self._columns.insert(colindex, new_column)
+        self._num_cols += 1
+        self._col_fixeds.insert(colindex, self._col_fixed)
+        # 只扫描新列自身的宽度列表
+        cap_tally = _WidthTally(new_column.wids)
+        floor_tally = _WidthTally(new_column.flrs)
+        self._cap_tallies.insert(colindex, cap_tally)
+        self._floor_tallies.insert(colindex, floor_tally)
+        self._col_caps.insert(colindex, cap_tally.max)
+        self._col_floors.insert(colindex, floor_tally.max)
+        self._texts = [None] * num_rows
+
+    def _remove_column(self, colindex):
+        self._num_cols -= 1
+        del self._col_fixeds[colindex]
+        del self._col_caps[colindex]
+        del self._col_floors[colindex]
+        del self._cap_tallies[colindex]
+        del self._floor_tallies[colindex]
+        self._texts = [None] * self._num_rows
+        return self._columns.pop(colindex).values
+
+    def _insert_row(self, rowindex, row_list):
+        self._insert_rows(rowindex, [row_list])
+
+    def _insert_rows(self, rowindex, row_lists, measured=None):
+        # 各列、各行属性列表长度相同，按同样的规则插入即可保持对应
+        for colind, column in enumerate(self._columns):
+            wids, flrs = column.insert(
+                rowindex,
+                [row[colind] for row in row_lists],
+                None if measured is None else measured[colind],
+            )
+            cap_tally = self._cap_tallies[colind]
+            floor_tally = self._floor_tallies[colind]
+            for width in wids:
+                cap_tally.add(width)
+            for width in flrs:
+                floor_tally.add(width)
+            self._col_caps[colind] = cap_tally.max
+            self._col_floors[colind] = floor_tally.max
+        count = len(row_lists)
+        default = _cell_format(self._alignh, self._alignv, self._fbgcolors)
+        self._row_fmts[rowindex:rowindex] = [default] * count
+        self._row_hits[rowindex:rowindex] = [self._row_fixed] * count
+        self._texts[rowindex:rowindex] = [None] * count
+        self._num_rows += count
+
+    def _remove_row(self, rowindex):
+        row = list()
+        for colind, column in enumerate(self._columns):
+            value, width, floor = column.pop(rowindex)
+            row.append(value)
+            cap_tally = self._cap_tallies[colind]
+            floor_tally = self._floor_tallies[colind]
+            if width in cap_tally and floor in floor_tally:
+                cap_tally.remove(width)
+                floor_tally.remove(floor)
+            else:
+                # 单元格被直接覆写过，计数对不上，见 Table._count_out 方法
+                cap_tally, floor_tally = self._recount(colind, None)
+                self._cap_tallies[colind] = cap_tally
+                self._floor_tallies[colind] = floor_tally
+            self._col_caps[colind] = cap_tally.max
+            self._col_floors[colind] = floor_tally.max
+        del self._row_fmts[rowindex]
+        del self._row_hits[rowindex]
+        del self._texts[rowindex]
+        self._num_rows -= 1
+        return row
+
+    def _recount(self, colindex, row):
+        # 直接取该列的宽度列表，row 是"行"视图，按行索引排除
+        column = self._columns[colindex]
+        wids, flrs = list(column.wids), list(column.flrs)
+        if row is not None:
+            del wids[row._index], flrs[row._index]
+        return _WidthTally(wids), _WidthTally(flrs)
+
+    def getColumn(self, colindex=-1):
+        '''
+        获取列源数据方法，直接复制该列的元素列表。
+        :param colindex: int，要获取的列的索引。
+        :return: list[any...]，要获取的列的列表形式。
+        '''
+        self._check_index(colindex=colindex)
+        if colindex is None:
+            return
+        return list(self._columns[colindex].values)
+
+    def getItem(self, rowindex=-1, colindex=-1):
+        '''
+        获取单元格源数据方法。
+        :param rowindex: int，单元格行索引。
+        :param colindex: int，单元格列索引。
+        :return: any，获取的单元个源数据。
+        '''
+        self._check_index(rowindex, colindex)
+        if rowindex is None or colindex is None:
+            return
+        return self._columns[colindex].values[rowindex]
+
+    def setSampling(self, enable=True, *, head=1000, size=1000, seed=None):
+        '''
+        ColumnTable 各列在添加时即整列测量，列宽总是准确的，不需要抽样估计列宽，本方
+        法不做任何事（快照仍触发 TypeError 异常，与 Table 一致），使为 Table 编写的代
+        码可以不加修改地使用 ColumnTable。
+        :return: None。
+        '''
+        self._check_frozen()
+
+
+class _SourceRow(_RowObj):
+    '''
+    Table.fromSource 创建的表格的"行"视图：按行索引从行数据源取出一行，叠加表格中
+    记录的覆写值、格式和行高，生成一个临时的 _RowObj；对它的覆写单元格、设置格式、
+    设置行高等操作记录到表格中，不修改行数据源。
+    '''
+
+    __slots__ = ('_table', '_index')
+
+    def __init__(self, table, index):
+        '''
+        初始化方法。
+        :param table: _SourceTable，所属表格。
+        :param index: int，行索引，不小于 1（0 是标题行）。
+        '''
+        num_cols = table._num_cols
+        row_list = list(table._source[index - 1])[:num_cols]
+        if len(row_list) < num_cols:
+            row_list.extend([table._filler] * (num_cols - len(row_list)))
+        written = table._cells.get(index)
+        if written:
+            for colind, value in written.items():
+                row_list[colind] = value
+        alignh, alignv, fbgc = table._source_fmt
+        super().__init__(
+            row_list,
+            table._col_wids,
+            table._hits.get(index, table._source_hit),
+            alignh,
+            alignv,
+            fbgc,
+        )
+        self._table = table
+        self._index = index
+        # 与表格共用同一个格式覆盖字典，原地修改即写回表格
+        self._overrides = table._fmts.get(index)
+        if self._overrides:
+            # 颜色集合已通过 getColor 交给外部，与 _RowObj 一样每次都重新渲染
+            self._clr_exposed = any(
+                isinstance(fmt[2], set) for fmt in self._overrides.values()
+            )
+        self._sampled = table._samples is None or index in table._samples
+
+    def __setitem__(self, index, value):
+        '''
+        覆写单元格，覆写值记录到表格中。
+        '''
+        index = self._colindex(index)
+        super().__setitem__(index, value)
+        self._table._cells.setdefault(self._index, dict())[index] = value
+
+    def _override(self, index, fmt):
+        super()._override(index, fmt)
+        if self._overrides:
+            self._table._fmts[self._index] = self._overrides
+        else:
+            self._table._fmts.pop(self._index, None)
+
+    def _height(self, height):
+        super()._height(height)
+        self._table._hits[self._index] = height
+
+
+class _SourceTable(_RowViews, Table):
+    '''
+    以行数据源为主体的表格，由 Table.fromSource 方法创建。
+    表格中只保存标题行，主体行由 _SourceRow 在测量列宽、输出时临时生成；覆写值、格式
+    覆盖和行高按行索引稀疏记录。不能增删行、列（触发 TypeError 异常，见
+    _check_resizable 方法）。
+    '''
+
+    def __init__(
+        self,
+        header,
+        source,
+        *,
+        alignh='l',
+        alignv='t',
+        rowfixed=0,
+        colfixed=0,
+        fbgc=None,
+        fill='',
+        style=None,
+    ):
+        super().__init__(
+            header,
+            alignh=alignh,
+            alignv=alignv,
+            rowfixed=rowfixed,
+            colfixed=colfixed,
+            fbgc=fbgc,
+            fill=fill,
+            style=style,
+        )
+        # 可索引的序列直接使用，其他可迭代对象（迭代器、游标等）只能遍历一次，先取出
+        if not (hasattr(source, '__getitem__') and hasattr(source, '__len__')):
+            source = list(source)
+        self._source = source
+        self._num_rows = len(source) + 1
+        # 主体行的默认格式和行高，取创建表格时的默认值
+        self._source_fmt = _cell_format(alignh, alignv, self._fbgcolors)
+        self._source_hit = rowfixed
+        # 稀疏记录：{行索引: {列索引: 覆写值}}、{行索引: 格式覆盖字典}、{行索引: 行高}
+        self._cells = dict()
+        self._fmts = dict()
+        self._hits = dict()
+        # 计入列宽计数器的主体行索引集合，None 表示全部计入，见 _resample 方法
+        self._samples = None
+        # 主体行是否已计入列宽计数器，第一次需要列宽时才遍历数据源测量
+        self._measured = False
+
+    def __len__(self):
+        return self._num_rows
+
+    def __iter__(self):
+        yield list.__getitem__(self, 0)
+        for index in range(1, self._num_rows):
+            yield _SourceRow(self, index)
+
+    def __getitem__(self, index):
+        '''
+        按行索引取行，主体行生成"行"视图，切片则生成行列表。
+        '''
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(self._num_rows))]
+        if index < 0:
+            index += self._num_rows
+        if not 0 <= index < self._num_rows:
+            raise IndexError('Row index out of range.')
+        if not index:
+            return list.__getitem__(self, 0)
+        return _SourceRow(self, index)
+
+    def snapshot(self):
+        '''
+        快照方法，用法见 Table.snapshot 方法。行数据源与快照共用，覆写值、格式覆盖和
+        行高是稀疏记录，复制一份。
+        '''
+        snap = super().snapshot()
+        snap._cells = {
+            index: dict(cells) for index, cells in self._cells.items()
+        }
+        snap._fmts = {
+            index: {colind: _fmt_copy(fmt) for colind, fmt in fmts.items()}
+            for index, fmts in self._fmts.items()
+        }
+        snap._hits = dict(self._hits)
+        return snap
+
+    def _owned(self, index):
+        if index < 0:
+            index += self._num_rows
+        # 只有标题行是表格中的行对象，主体行的修改都记录在表格自己的稀疏记录中
+        if not index:
+            return super()._owned(0)
+        self._check_frozen()
+        return self[index]
+
+    def _measure_source(self):
+        '''
+        遍历数据源，将主体行（抽样时只是入样的行）的单元格宽度计入各列宽度计数器，
+        只在第一次需要列宽时执行一次。
+        '''
+        if self._measured:
+            return
+        self._measured = True
+        if self._samples is None:
+            indices = range(1, self._num_rows)
+        else:
+            indices = sorted(self._samples)
+        for index in indices:
+            row = _SourceRow(self, index)
+            for colind in range(self._num_cols):
+                self._cap_tallies[colind].add(row._colcap(colind))
+                self._floor_tallies[colind].add(row._colflr(colind))
+        self._col_caps = [tally.max for tally in self._cap_tallies]
+        self._col_floors = [tally.max for tally in self._floor_tallies]
+
+    def _col_wids_refresh(self):
+        self._measure_source()
+        super()._col_wids_refresh()
+
+    def _write(self, row, colindex, value):
+        self._measure_source()
+        super()._write(row, colindex, value)
+
+    def _recount(self, colindex, row):
+        # 主体行是临时生成的"行"视图，按行索引排除 row
+        index = row._index if isinstance(row, _SourceRow) else 0
+        others = [r for i, r in enumerate(self) if r._sampled and i != index]
+        return (
+            _WidthTally(r._colcap(colindex) for r in others),
+            _WidthTally(r._colflr(colindex) for r in others),
+        )
+
+    def _resample(self, enable, head, size, seed):
+        # 数据源可以按索引取行且行数已知，开头 head 行之外直接随机抽取 size 行，
+        # 不必使用蓄水池；抽样器只用作"正在抽样估计列宽"的标志和随机数来源
+        if enable:
+            self._sampler = _RowSampler(head, size, seed)
+            rest = range(head + 1, self._num_rows)
+            picked = self._sampler._random.sample(rest, min(size, len(rest)))
+            self._samples = set(range(1, min(head + 1, self._num_rows)))
+            self._samples.update(picked)
+        else:
+            self._sampler = None
+            self._samples = None
+        # 各列宽度计数器只保留标题行，下次需要列宽时按新的抽样结果重新测量
+        head_row = list.__getitem__(self, 0)
+        self._cap_tallies = [
+            _WidthTally((head_row._colcap(i),)) for i in range(self._num_cols)
+        ]
+        self._floor_tallies = [
+            _WidthTally((head_row._colflr(i),)) for i in range(self._num_cols)
+        ]
+        self._measured = False
+        self._measure_source()
+
+    def _check_resizable(self):
+        # 主体行来自行数据源，不能增删行、列
+        raise TypeError(
+            'Rows and columns cannot be added to or deleted from a table '
+            'over a row source.'
+        )
+
+
+class StreamTable(object):
+    '''
+    只追加的流式表格，用于数据边产生边输出的场合（例如跟踪日志、任务状态）。
+        1.列宽在输出第一个数据行之前确定：由 widths 参数直接指定，或者根据标题行和最
+        先添加的 learn 行学习得到，此后不再改变，超出列宽的内容折行显示；学习得到的
+        列宽至少为 2，以放得下之后可能出现的宽字符（如汉字），所以只有一个字符宽的列
+        比同样内容的 Table 宽 1，其余与 Table.getText 的输出相同；widths 指定的列宽
+        则原样使用，某一列宽为 1 时放不下宽字符，含宽字符的行触发 ValueError 异常；
+        2.标题行及 hat、neck 边框线只输出一次，此后每添加一行即刻输出该行，行与行之
+        间输出 belt 分隔线，耗时只与该行有关，与已输出多少行无关；
+        3.close 方法输出 shoes 边框线，关闭后不能再添加行。也可用 with 语句自动关闭。
+    '''
+
+    def __init__(
+        self,
+        header,
+        *,
+        widths=None,
+        learn=20,
+        file=None,
+        color=True,
+        alignh='l',
+        alignv='t',
+        rowfixed=0,
+        fbgc=None,
+        fill='',
+        style=None,
+        compact=False,
+    ):
+        '''
+        初始化方法。
+        :param header: Iterable，表格标题行。
+        :param widths: list[int]|tuple[int]，各列的固定列宽，不大于 MAX_COLUMN_WIDTH，
+        给出时不学习列宽，立即输出标题行，默认 None。
+        :param learn: int，未给出 widths 时，缓存最先添加的多少行用于学习列宽，缓存满
+        了才开始输出，默认 20，为 0 时只根据标题行确定列宽并立即输出标题行。
+        :param file: 任何有 write 方法的对象，默认 None 即创建时的 sys.stdout，流式表
+        格不会关闭它。
+        :param color: bool，是否输出彩色表格，默认 True。
+        :param alignh、alignv、rowfixed、fbgc、fill、style: 同 Table 类的初始化参数。
+        :param compact: bool，是否合并相邻的相同颜色控制码，同 Table.setCompact 方法。
+        '''
+        file = _output_file(file, color)
+        if not callable(getattr(file, 'write', None)):
+            raise TypeError('Parameter <file> should have a "write" method.')
+        if not isinstance(learn, int):
+            raise TypeError(
+                'Integer parameter <learn> expected, got %s.'
+                % type(learn).__name__
+            )
+        if learn < 0:
+            raise ValueError('The value of <learn> cannot be less than 0.')
+        # 借用一个 Table 实例保存标题行和学习列宽用的行，以及各项默认设置、边框线
+        self._table = Table(
+            header,
+            alignh=alignh,
+            alignv=alignv,
+            rowfixed=rowfixed,
+            fbgc=fbgc,
+            fill=fill,
+            style=style,
+        )
+        if widths is not None:
+            if not isinstance(widths, (list, tuple)):
+                raise TypeError(
+                    'Type of parameter <widths> should be "list" or "tuple".'
+                )
+            if len(widths) != self._table._num_cols:
+                raise ValueError(
+                    'The length of <widths> should be equal to the number '
+                    'of columns.'
+                )
+            if not all(isinstance(w, int) and w > 0 for w in widths):
+                raise ValueError(
+                    'Items of <widths> should be positive integers.'
+                )
+            if max(widths, default=0) > MAX_COLUMN_WIDTH:
+                raise ValueError(
+                    'The column width to be set exceeds the limit(%d), '
+                    'please modify the value of "MAX_COLUMN_WIDTH" '
+                    'if necessary.' % MAX_COLUMN_WIDTH
+                )
+            _check_fits(self._table[0], widths)
+            self._table._col_fixeds = list(widths)
+            learn = 0
+        else:
+            # 列宽确定后添加的行不再测量，按抽样估计列宽处理，列宽至少能放下一个宽字符
+            self._table.setSampling(head=learn, size=0)
+        self._table.setCompact(compact)
+        self._learn = learn
+        # widths 中有放不下宽字符的列宽时，输出每一行之前都要检查
+        self._narrow = widths is not None and min(widths) < _MAX_CHR_WID
+        self._file = file
+        self._color = color
+        # 是否需要像 Table.show 一样逐项输出，原因见 Table.show 方法中的注释，
+        # 开始输出时才检测（见 _start 方法），不输出时不做检测
+        self._itemized = False
+        # 是否已输出标题行（即列宽已确定）、已输出的数据行数、是否已关闭
+        self._started = False
+        self._num_rows = 0
+        self._closed = False
+        # 列宽确定后的渲染参数和边框线，见 _start 方法
+        self._ctx = None
+        self._border = None
+        if not learn:
+            self._start()
+
+    @classmethod
+    def fromCursor(
+        cls,
+        cursor,
+        *,
+        batch_size=1000,
+        max_rows=None,
+        widths=None,
+        learn=20,
+        file=None,
+        color=True,
+        alignh='l',
+        alignv='t',
+        rowfixed=0,
+        fbgc=None,
+        fill='',
+        style=None,
+        compact=False,
+    ):
+        '''
+        边查询边输出 DB-API 游标（如 sqlite3.Cursor）的查询结果：以 cursor.description
+        中的各列名作为标题行，用 cursor.fetchmany 每次取 batch_size 行，取到即输出（学
+        满 learn 行确定列宽后），不等查询结束，也不在内存中保存已输出的行。取完后关闭
+        流式表格。
+        :param cursor: 已执行查询的 DB-API 游标，有 description 属性和 fetchmany 方法。
+        :param batch_size: int，每次 fetchmany 取多少行，默认 1000。
+        :param max_rows: int，最多取多少行，默认 None（全部）。
+        其余参数与 StreamTable 类初始化参数相同。
+        :return: StreamTable，已关闭的流式表格。
+        '''
+        header = _cursor_header(cursor, batch_size, max_rows)
+        stream = cls(
+            header,
+            widths=widths,
+            learn=learn,
+            file=file,
+            color=color,
+            alignh=alignh,
+            alignv=alignv,
+            rowfixed=rowfixed,
+            fbgc=fbgc,
+            fill=fill,
+            style=style,
+            compact=compact,
+        )
+        table = stream._table
+        with stream:
+            # 每取到一批行才 flush 一次，不像 addRow 方法那样每行 flush 一次
+            for batch in _fetch_batches(
+                cursor, batch_size, max_rows, table._num_cols, table._filler
+            ):
+                for row in batch:
+                    stream._append(row)
+                stream._flush()
+        return stream
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+    @property
+    def closed(self):
+        '''
+        流式表格是否已关闭。
+        '''
+        return self._closed
+
+    def addRow(self, row):
+        '''
+        添加一行并立即输出（仍在学习列宽时先缓存，学满 learn 行后一起输出）。
+        行的元素多于列数则截断，少于列数则用 fill 补足，同 Table.addRow 方法。行中有
+        widths 指定的列宽放不下的宽字符时触发 ValueError 异常，该行不输出。
+        :param row: Iterable，要添加的行。
+        :return: None。
+        '''
+        if self._closed:
+            raise ValueError('Cannot add rows to a closed stream table.')
+        if not isinstance(row, Iterable):
+            raise TypeError(
+                'Iterable parameter <row> expected, got %s.'
+                % type(row).__name__
+            )
+        self._append(row)
+        self._flush()
+
+    def _append(self, row):
+        '''
+        添加一行，已确定列宽时立即渲染并写入输出对象，但不调用其 flush 方法。
+        :param row: Iterable，要添加的行，已由调用者检查。
+        '''
+        table = self._table
+        if not self._started:
+            table.addRow(row)
+            if table._num_rows - 1 >= self._learn:
+                self._start()
+            return
+        row_list = list(row)
+        len_row = len(row_list)
+        if len_row > table._num_cols:
+            row_list = row_list[: table._num_cols]
+        elif len_row < table._num_cols:
+            row_list.extend([table._filler] * (table._num_cols - len_row))
+        # 新行共用已确定的列宽列表，渲染后即丢弃，不保存在表格中
+        row_obj = _RowObj(
+            row_list,
+            table._col_wids,
+            table._row_fixed,
+            table._alignh,
+            table._alignv,
+            table._fbgcolors,
+        )
+        if self._narrow:
+            _check_fits(row_obj, table._col_wids)
+        self._emit(row_obj)
+
+    def close(self):
+        '''
+        关闭流式表格：输出尚在缓存中的行和 shoes 边框线。重复调用不做任何事。
+        :return: None。
+        '''
+        if self._closed:
+            return
+        if not self._started:
+            self._start()
+        self._write(self._border['shoes'] + self._ctx.lnsep)
+        self._flush()
+        self._closed = True
+
+    def _start(self):
+        '''
+        确定列宽，输出 hat 边框线、标题行和用于学习列宽的缓存行。
+        '''
+        table = self._table
+        self._itemized = _NT and self._color and not _on_idle()
+        self._ctx = table._context(self._color)
+        _, self._border = table._refresh(self._ctx)
+        self._started = True
+        self._write(self._border['hat'] + self._ctx.lnsep)
+        self._render(table[0])
+        # 学习列宽用的行最多 learn 行，输出后仍留在表格中，不影响已确定的列宽
+        for row_obj in table[1:]:
+            self._emit(row_obj)
+        self._flush()
+
+    def _emit(self, row_obj):
+        '''
+        输出一个数据行，第一个数据行之前输出 neck 边框线，其余行之前输出 belt 分隔线。
+        没有任何数据行时 close 方法直接在标题行下输出 shoes 边框线，与 Table 一致。
+        '''
+        border, lnsep = self._border, self._ctx.lnsep
+        if not self._num_rows:
+            self._write(border['neck'] + lnsep)
+        elif border['belt']:
+            self._write(border['belt'] + lnsep)
+        self._render(row_obj)
+        self._num_rows += 1
+
+    def _render(self, row_obj):
+        '''
+        按已确定的列宽渲染行 row_obj 并输出。
+        '''
+        ctx = self._ctx
+        if self._itemized:
+            _write_itemized(self._file, row_obj._form(ctx), ctx)
+            return
+        self._write(row_obj._getrowtext(ctx) + ctx.lnsep)
+
+    def _write(self, text):
+        '''
+        将文本写入输出对象。
+        '''
+        _write_text(self._file, text)
+
+    def _flush(self):
+        '''
+        输出对象有 flush 方法则调用它，使已添加的行立即显示。
+        '''
+        flush = getattr(self._file, 'flush', None)
+        if callable(flush):
+            flush()
+
+
+def _check_fits(row, widths):
+    '''
+    检查行 row 的各单元格中最宽的字符是否放得下 widths 指定的列宽，放不下时触发
+    ValueError 异常。
+    :param row: _RowObj，要检查的行。
+    :param widths: list[int]|tuple[int]，各列的列宽。
+    '''
+    for colind, width in enumerate(widths):
+        if row._colflr(colind) > width:
+            raise ValueError(
+                'The width of column %d (%d) is too narrow for the characters '
+                'in %r.' % (colind, width, row._strs[colind])
+            )
+
+
+def _cursor_header(cursor, batch_size, max_rows):
+    '''
+    检查 fromCursor 方法的参数，返回游标查询结果的各列名，用作标题行。
+    :param cursor: DB-API 游标。
+    :param batch_size: int，每次 fetchmany 取多少行。
+    :param max_rows: int|None，最多取多少行。
+    :return: list[str]，各列名。
+    '''
+    if not callable(getattr(cursor, 'fetchmany', None)):
+        raise TypeError('Parameter <cursor> should have a "fetchmany" method.')
+    if not isinstance(batch_size, int):
+        raise TypeError(
+            'Integer parameter <batch_size> expected, got %s.'
+            % type(batch_size).__name__
+        )
+    if batch_size < 1:
+        raise ValueError('The value of <batch_size> cannot be less than 1.')
+    if not (isinstance(max_rows, int) or max_rows is None):
+        raise TypeError(
+            'Integer parameter <max_rows> or "None" expected, got %s.'
+            % type(max_rows).__name__
+        )
+    if max_rows is not None and max_rows < 0:
+        raise ValueError('The value of <max_rows> cannot be less than 0.')
+    # 未执行查询或执行的不是查询语句时 description 为 None
+    if not cursor.description:
+        raise ValueError('The cursor has no result set.')
+    return [column[0] for column in cursor.description]
+
+
+def _fetch_batches(cursor, batch_size, max_rows, num_cols, filler):
+    '''
+    用 cursor.fetchmany 逐批取出查询结果，最多取 max_rows 行。各行元素多于列数则截
+    断，少于列数则用 filler 补足，与 Table.addRow 方法相同。
+    :param num_cols: int，列数。
+    :param filler: any，补足行元素用的填充物。
+    :return: Iterator[list[list]]，各批行列表。
+    '''
+    remain = -1 if max_rows is None else max_rows
+    while remain:
+        size = batch_size if remain < 0 else min(batch_size, remain)
+        batch = list(cursor.fetchmany(size))
+        if not batch:
+            return
+        if remain > 0:
+            del batch[remain:]
+            remain -= len(batch)
+        # 各行（通常是元组）长度一般与列数相同，可直接插入表格，不必复制
+        for index, row in enumerate(batch):
+            if len(row) != num_cols:
+                row = list(row)[:num_cols]
+                row.extend([filler] * (num_cols - len(row)))
+                batch[index] = row
+        yield batch
+
+
+def _output_file(file, color):
+    '''
+    取得输出对象：file 为 None 时取此刻的 sys.stdout。彩色输出时先检测运行环境，
+    windows 终端上 colorama 初始化时会替换 sys.stdout，所以要检测之后再取，不能在
+    导入本模块时就把 sys.stdout 绑定为默认参数。
+    :param file: 任何有 write 方法的对象或 None。
+    :param color: bool，是否彩色输出。
+    :return: 输出对象。
+    '''
+    if file is not None:
+        return file
+    if color:
+        _detect()
+    return sys.stdout
+
+
+def _write_itemized(file, rowform, ctx):
+    '''
+    逐项输出 _RowObj._form 方法返回的已格式化"表格行"，每个单元格片段和垂直边框线
+    都单独调用一次 file.write。
+    :param file: 任何有 write 方法的对象。
+    :param rowform: list[list[str]]，已格式化的"表格行"。
+    :param ctx: _RenderContext，渲染参数，使用其中的垂直边框线和换行符。
+    '''
+    for line in rowform:
+        len_line = len(line)
+        file.write(ctx.left_vert)
+        for ind, string in enumerate(line):
+            file.write(string)
+            if ind != len_line - 1:
+                file.write(ctx.center_vert)
+        file.write(ctx.right_vert + ctx.lnsep)
+
+
+def _render_chunk(ctx, col_wids, affixes, payloads):
+    '''
+    在进程池的子进程中渲染一块"行"，由 Table._render_pool 方法调用。
+    :param ctx: _RenderContext，渲染参数。
+    :param col_wids: list[int]，冻结的列宽。
+    :param affixes: dict，冻结的颜色控制码 {frozenset(颜色名称): (前缀, 后缀)}。
+    :param payloads: list[tuple]，各行的 (单元格字符串列表, 行高, 默认格式, 格式覆盖
+    字典)。
+    :return: list[str]，各行的字符串形式。
+    '''
+    # 预先填入主进程编译的颜色控制码，子进程不再自行检测和编译
+    _AFFIXES.update(affixes)
+    texts = list()
+    for strs, rowhit, default, overrides in payloads:
+        row = _RowObj(strs, col_wids, rowhit, *default)
+        row._strs = strs
+        row._overrides = overrides
+        texts.append(row._getrowtext(ctx))
+    return texts
+
+
+# 重置所有颜色属性的控制码
+_SGR_RESET = '\033[0m'
+# 颜色设置码是否只设置前景色的缓存：{设置颜色码: bool}
+_FG_ONLY = dict()
+
+
+def _fg_only(prefix):
+    '''
+    判断颜色设置码是否只设置了前景色。只设置前景色时，空格的显示效果与无颜色时相同。
+    :param prefix: str，设置颜色码，如 '\033[31m'，空字符串表示无颜色。
+    :return: bool。
+    '''
+    result = _FG_ONLY.get(prefix)
+    if result is None:
+        codes = prefix[2:-1].split(';') if prefix else ()
+        result = bool(codes) and all(
+            code.isdigit()
+            and (
+                30 <= int(code) <= 37 or code == '39' or 90 <= int(code) <= 97
+            )
+            for code in codes
+        )
+        _FG_ONLY[prefix] = result
+    return result
+
+
+def _join_compact(cells, prefixes, ctx):
+    '''
+    拼接一个文本行，并合并相邻的相同颜色控制码：
+        1.相邻片段颜色相同时不重复输出设置颜色码和重置颜色码；
+        2.当前颜色只设置了前景色时，只含空格的无颜色片段（如 simple 风格的垂直边框
+        线、空白单元格）直接沿用当前颜色，不必先重置；
+        3.颜色改变时用一个控制码完成重置和设置，如 '\033[0;32m'；
+        4.行尾重置颜色，每个文本行都不影响其后的输出。
+    :param cells: list[str]，不带颜色控制码的各单元格文本（已填充、对齐）。
+    :param prefixes: list[str]，各单元格的设置颜色码，空字符串表示无颜色。
+    :param ctx: _RenderContext，渲染参数，使用其中的垂直边框线。
+    :return: str，拼接好的文本行。
+    '''
+    parts, active = [ctx.left_vert], ''
+    last = len(cells) - 1
+    for index, cell in enumerate(cells):
+        border = ctx.right_vert if index == last else ctx.center_vert
+        for text, prefix in ((cell, prefixes[index]), (border, '')):
+            if not text or prefix == active:
+                parts.append(text)
+                continue
+            if not prefix and not text.strip(' ') and _fg_only(active):
+                parts.append(text)
+                continue
+            if not prefix:
+                parts.append(_SGR_RESET)
+            elif active:
+                parts.append(''.join(('\033[0;', prefix[2:])))
+            else:
+                parts.append(prefix)
+            parts.append(text)
+            active = prefix
+    if active:
+        parts.append(_SGR_RESET)
+    return ''.join(parts)
+
+
+def _write_fd(fd, data):
+    '''
+    用 os.write 将字节串全部写入文件描述符 fd（os.write 可能只写入一部分）。
+    :param fd: int，文件描述符。
+    :param data: bytes|bytearray，要写入的字节串。
+    '''
+    view = memoryview(data)
+    while view:
+        view = view[os_write(fd, view) :]
+
+
+def _write_lines(file, lines, chunksize):
+    '''
+    将文本行（不含换行符）分块写入 file，每攒够 chunksize 个字符调用一次 file.write。
+    只有写入出错才转换为 IOError（保留原异常作为原因），生成文本行时出错原样抛出。
+    :param file: 任何有 write 方法的对象。
+    :param lines: Iterable[str]，要写入的文本行。
+    :param chunksize: int，每块的字符数。
+    '''
+    chunk, size, lnsep = list(), 0, _LNSEP
+    for line in lines:
+        chunk.append(line)
+        chunk.append(lnsep)
+        size += len(line) + len(lnsep)
+        if size >= chunksize:
+            _write_text(file, ''.join(chunk))
+            chunk.clear()
+            size = 0
+    if chunk:
+        _write_text(file, ''.join(chunk))
+    flush = getattr(file, 'flush', None)
+    if callable(flush):
+        try:
+            flush()
+        except Exception as e:
+            raise IOError(
+                'Failed to write to file or print on terminal.'
+            ) from e
+
+
+def _write_text(file, text):
+    '''
+    将文本写入 file，出错时转换为 IOError，保留原异常作为原因。
+    '''
+    try:
+        file.write(text)
+    except Exception as e:
+        raise IOError('Failed to write to file or print on terminal.') from e
+
+
+def _write_bytes(write, data):
+    '''
+    调用 write(data) 写入字节串，出错时转换为 IOError，保留原异常作为原因。
+    '''
+    try:
+        write(data)
+    except Exception as e:
+        raise IOError('Failed to write to file or print on terminal.') from e
+
+
+def _measure_cell(value):
+    '''
+    测量单元格：将单元格元素转换成 str 并去除 __EXCLUDED__ 中的字符，同时计算其
+    显示宽度（不能为 0，所以 "..or 1"）和最大单个字符宽度（即列宽下限）。
+    :param value: any，单元格元素。
+    :return: tuple[str, int, int]，(字符串形式, 显示宽度, 最大单个字符宽度)。
+    '''
+    raw = str(value)
+    # 可打印的 ASCII 字符串（最常见的情况）不含 __EXCLUDED__ 中的字符和换行符，每个
+    # 字符宽度都是 1，不必逐项检查
+    if _isascii(raw) and raw.isprintable():
+        return raw, len(raw) or 1, 1
+    string = raw
+    for escc in __EXCLUDED__:
+        if escc in string:
+            string = string.replace(escc, '')
+    return string, _str_wid(raw) or 1, _max_char_wid(raw)
+
+
+def _measure_column(values):
+    '''
+    整批测量一列单元格，结果与逐个调用 _measure_cell 相同：整批都是可打印的 ASCII
+    字符串时，显示宽度就是长度，列宽下限都是 1，不必逐个测量，也不为每个单元格创建
+    结果元组。
+    :param values: Iterable[any]，一列单元格元素。
+    :return: tuple[list[str], list[int], list[int]]，(各字符串形式, 各显示宽度,
+    各最大单个字符宽度)。
+    '''
+    strs = list(map(str, values))
+    joined = ''.join(strs)
+    if _isascii(joined) and joined.isprintable():
+        return strs, [len(string) or 1 for string in strs], [1] * len(strs)
+    strs, wids, flrs = zip(*map(_measure_cell, strs))
+    return list(strs), list(wids), list(flrs)
+
+
+def _measure_array(column):
+    '''
+    整批测量 numpy 一维数组表示的一列单元格，结果与逐个调用 _measure_cell 相同：
+        1.整列一次转换为字符串数组（astype(str)），其各项与对各单元格元素调用 str 的
+        结果相同（只对这样的数据类型这样做）。对象数组不这样做：numpy 会把其中的
+        bytes 解码、去掉末尾的 '\0'，与 str 的结果不同，所以与其他类型一样由
+        _measure_column 函数逐个调用 str 后整批测量；
+        2.字符串数组的每一项是定长的 UTF-32 码点，不足部分补 0，把它看作二维码点数组，
+        整列都是可打印的 ASCII 字符时，每行非 0 码点的个数就是显示宽度，列宽下限都是
+        1，不必逐个单元格计算；否则逐个调用 _measure_cell 测量。
+    :param column: numpy.ndarray，一维数组。
+    :return: tuple[list, list[str], list[int], list[int]]，(各单元格元素, 各字符串形
+    式, 各显示宽度, 各最大单个字符宽度)。
+    '''
+    kind = column.dtype.kind
+    # 布尔、整数、字符串和对象取 Python 对象；浮点数等保留 numpy 标量（float64 是 float
+    # 的子类），转换为 Python 对象后 float32 的 str 结果会变长，datetime64 会变成整数
+    values = column.tolist() if kind in 'biuUO' else list(column)
+    if kind not in 'biufU' or not values:
+        return (values,) + _measure_column(values)
+    strs = column.astype(str)
+    codes = strs.view('u4').reshape(len(values), strs.dtype.itemsize // 4)
+    if not ((codes == 0) | ((codes >= 0x20) & (codes < 0x7F))).all():
+        return (values,) + _measure_column(strs.tolist())
+    wids = (codes != 0).sum(axis=1).clip(1)
+    return values, strs.tolist(), wids.tolist(), [1] * len(values)
+
+
+def _frame_column(series):
+    '''
+    取出 pandas 的一列（或索引）的 numpy 数组。日期时间类型转换为 Timestamp、Timedelta
+    对象数组；可空整数等扩展类型转换为对象数组，缺失值仍是 pd.NA 而不是 nan，使单元
+    格的字符串形式与 pandas 显示的一致。
+    :param series: pandas.Series|pandas.Index，列或索引。
+    :return: numpy.ndarray，一维数组。
+    '''
+    array = series.to_numpy()
+    if series.dtype != array.dtype or array.dtype.kind in 'Mm':
+        array = series.to_numpy(dtype=object)
+    return array
+
+
+# 字符宽度表：(起始码点, 结束码点, 宽度)，按起始码点升序排列，区间互不重叠。
+# 表中未列出的码点宽度一律视为 1（判断并不十分准确，可能有错）。
+_WIDTH_RANGES = (
+    # 控制字符
+    (0x0000, 0x0000, 0),
+    (0x0008, 0x0009, 0),
+    (0x000B, 0x000B, 0),
+    (0x000D, 0x000D, 0),
+    (0x001F, 0x001F, 0),
+    (0x007F, 0x007F, 0),
+    # 韩文字母：1100-11FF
+    (0x1100, 0x11FF, 2),
+    # CJK部首补充：2E80-2EFF
+    # 康熙部首：2F00-2FDF
+    (0x2E80, 0x2FDF, 2),
+    # 汉字结构描述符：2FF0-2FFF
+    # CJK标点符号：3000-303F
+    # 日文平假名：3040-309F
+    # 日文片假名：30A0-30FF
+    # 注音符号：3100-312F
+    (0x2FF0, 0x312F, 2),
+    # 韩文兼容字母：3130-318F
+    (0x3130, 0x318F, 2),
+    # CJK笔划：31C0-31EF
+    # 日文片假名拼音扩展：31F0-31FF
+    (0x31C0, 0x31FF, 2),
+    # CJK字母及月份：3200-32FF（3248-324F 宽度为 1）
+    (0x3200, 0x3247, 2),
+    (0x3250, 0x32FF, 2),
+    # CJK特殊符号：3300-33FF
+    (0x3300, 0x33FF, 2),
+    # 扩展A	6582字	3400-4DB5
+    (0x3400, 0x4DB5, 2),
+    (0x4DC0, 0x4DFF, 2),
+    # 基本CJK文字
+    (0x4E00, 0x9FFF, 2),
+    # 彝文音节：A000-A48F
+    # 彝文部首：A490-A4CF
+    (0xA000, 0xA4CF, 2),
+    # 韩文拼音：AC00-D7AF
+    (0xAC00, 0xD7AF, 2),
+    # 兼容汉字	477字	F900-FAFF
+    (0xF900, 0xFAFF, 2),
+    # 全角ASCII、全角中英文标点
+    # 半宽片假名、半宽平假名、半宽韩文字母：FF00-FFEF（FF61-FFDF、FFE7-FFEF 宽度为 1）
+    (0xFF00, 0xFF60, 2),
+    (0xFFE0, 0xFFE6, 2),
+    # 太玄经符号：1D300-1D35F
+    (0x1D300, 0x1D35F, 2),
     # 扩展B	42711字	20000-2A6D6
-    if 0x20000 <= code <= 0x2A6D6:
-        return 2
+    (0x20000, 0x2A6D6, 2),
     # 扩展C	4149字	2A700-2B734
-    if 0x2A700 <= code <= 0x2B734:
-        return 2
+    (0x2A700, 0x2B734, 2),
     # 扩展D	222字	2B740-2B81D
-    if 0x2B740 <= code <= 0x2B81D:
-        return 2
+    (0x2B740, 0x2B81D, 2),
     # 扩展E	5762字	2B820-2CEA1
-    if 0x2B820 <= code <= 0x2CEA1:
-        return 2
+    (0x2B820, 0x2CEA1, 2),
     # 扩展F	7473字	2CEB0-2EBE0
-    if 0x2CEB0 <= code <= 0x2EBE0:
-        return 2
+    (0x2CEB0, 0x2EBE0, 2),
     # 兼容汉字扩展	542字	2F800-2FA1D
-    if 0x2F800 <= code <= 0x2FA1D:
-        return 2
+    (0x2F800, 0x2FA1D, 2),
     # 扩展G	4939字	30000-3134A
-    if 0x30000 <= code <= 0x3134A:
-        return 2
-    # 控制字符
-    if code in (0x0000, 0x0008, 0x0009, 0x000B, 0x000D, 0x001F, 0x007F):
-        return 0
-    # 猜测其他 Unicode 字符宽度为 1
-    return 1
+    (0x30000, 0x3134A, 2),
+)
+# 拆分为三个平行元组，供 bisect 二分查找使用
+_WIDTH_STARTS = tuple(r[0] for r in _WIDTH_RANGES)
+_WIDTH_ENDS = tuple(r[1] for r in _WIDTH_RANGES)
+_WIDTH_VALUES = tuple(r[2] for r in _WIDTH_RANGES)
+# 单个字符的最大宽度
+_MAX_CHR_WID = max(_WIDTH_VALUES)
+# 字符宽度缓存：{字符: 宽度}，查过一次的字符以后直接取缓存
+_CHR_WIDS = dict()
+
+try:
+    _isascii = str.isascii
+except AttributeError:  # Python 3.7 以下没有 str.isascii，不走快速通道
+
+    def _isascii(string):
+        return False
+
+
+def _chr_wid(char):
+    '''
+    根据字符char的unicode码判断该字符的宽度并返回宽度值。
+    :param char: str，给定的字符。
+    :return: int，字符的宽度（判断并不十分准确，可能有错）。
+    '''
+    width = _CHR_WIDS.get(char)
+    if width is not None:
+        return width
+    code = ord(char)
+    # 在宽度表中二分查找 code 所在区间，不在任何区间内则宽度为 1
+    index = bisect_right(_WIDTH_STARTS, code) - 1
+    if index >= 0 and code <= _WIDTH_ENDS[index]:
+        width = _WIDTH_VALUES[index]
+    else:
+        width = 1
+    _CHR_WIDS[char] = width
+    return width
+
+
+def _line_wid(string):
+    '''返回不含换行符的字符串 string 的总宽度。'''
+    if _isascii(string) and string.isprintable():
+        # 可打印 ASCII 字符宽度都是 1
+        return len(string)
+    cache, width = _CHR_WIDS, 0
+    for char in string:
+        char_wid = cache.get(char)
+        if char_wid is None:
+            char_wid = _chr_wid(char)
+        width += char_wid
+    return width
 
 
 def _str_wid(string):
@@ -1631,45 +4645,30 @@ def _str_wid(string):
     以半角英文字符为一个单位宽度，返回字符串的总宽度。
     如果中间有换行符，则计算换行符间的字符串宽度，返回它们之中最大的宽度。
     '''
-    strings_max_width, sub_str_width = 0, 0
-    for c in string:
-        if c in (_LNSEP, '\n'):
-            if sub_str_width > strings_max_width:
-                strings_max_width = sub_str_width
-            sub_str_width = 0
-            continue
-        sub_str_width += _chr_wid(c)
-    if sub_str_width > strings_max_width:
-        strings_max_width = sub_str_width
-    return strings_max_width
+    if _isascii(string) and string.isprintable():
+        return len(string)
+    if '\n' not in string:
+        return _line_wid(string)
+    return max(_line_wid(s) for s in string.split('\n'))
 
 
 def _max_char_wid(string):
     '''返回字符串string中宽度最大的单个字符的宽度值。'''
     if not string:
         return 1  # 列宽度下限不能为0，限制下限为1。
-    return max(_chr_wid(char) for char in string)
+    if _isascii(string) and string.isprintable():
+        return 1
+    # 只需查询不重复的字符
+    return max(map(_chr_wid, set(string)))
 
 
-def _format(rowfromsrc, rowhit, colwids, alignhs, alignvs, fbgcs, padding):
-    row_from_src = _items_to_str(rowfromsrc)
-    for ind, string in enumerate(row_from_src):
-        for escc in __EXCLUDED__:
-            string = string.replace(escc, '')
-        row_from_src[ind] = string
-    row_with_cells = list()
-    for ind, string in enumerate(row_from_src):
-        if alignvs[ind].lower() in ('b', 'bottom'):
-            split = _rsplit
-        else:
-            split = _lsplit
-        row_with_cells.append(split(string, colwids[ind]))
+def _format(row_with_cells, rowhit, colwids, alignhs, alignvs, fbgcs, ctx):
     if rowhit == 0:
         rowhit = max(len(lst) for lst in row_with_cells)
     for ind, stringlist in enumerate(row_with_cells):
         _format_v(stringlist, rowhit, alignvs[ind])
         _format_h(stringlist, colwids[ind], alignhs[ind])
-        _format_o(stringlist, fbgcs[ind], padding)
+        _format_o(stringlist, fbgcs[ind], ctx)
     return row_with_cells
 
 
@@ -1720,16 +4719,25 @@ def _format_h(stringlist, colwid, alignh):
         stringlist[ind] = fmt(string, colwid, alignh)
 
 
-def _format_o(stringlist, fbgc, padding):
-    mixed_color = ''
-    if _COLOR:
-        for color in fbgc:
-            mixed_color += getattr(_colors, color)
+def _format_o(stringlist, fbgc, ctx):
+    padding = ctx.padding
+    if ctx.color and fbgc:
+        # 颜色集合编译结果是缓存共享的，不必每个单元格都重新组合颜色
+        prefix, suffix = _color_affix(fbgc)
+    else:
+        prefix = suffix = ''
     for index, string in enumerate(stringlist):
-        stringlist[index] = mixed_color + ''.join((padding, string, padding))
+        stringlist[index] = ''.join((prefix, padding, string, padding, suffix))
 
 
 def _lsplit(string, width):
+    '''
+    从左往右将字符串 string 按宽度 width 切分成多个子字符串（遇换行符也切分）。
+    只遍历一次字符串，同时累计当前子字符串宽度，耗时与字符串长度成线性关系。
+    :param string: str，要切分的字符串。
+    :param width: int，子字符串的最大宽度。
+    :return: list[str]，切分后的子字符串列表。
+    '''
     if not isinstance(string, str):
         raise TypeError('Type of value of parameter <string> should be "str".')
     if width < _max_char_wid(string):
@@ -1739,27 +4747,47 @@ def _lsplit(string, width):
         )
     if not string:
         return [string]
-    start, stop, lenstr, substrings = 0, 1, len(string), list()
-    while stop <= lenstr:
-        strwid = _str_wid(string[start:stop])
-        if strwid > width:
-            substrings.append(string[start : stop - 1])
-            start = stop - 1
-        elif strwid == width:
-            substrings.append(string[start:stop])
-            start, stop = stop, stop + 1
-        elif string[stop - 1] == _LNSEP or string[stop - 1] == '\n':
-            substrings.append(string[start : stop - 1])
-            start = stop
-            stop += 1
-        else:
-            stop += 1
-    if start < lenstr:
+    if _isascii(string) and string.isprintable():
+        # 可打印 ASCII 字符宽度都是 1，直接按 width 等长切分
+        return [
+            string[ind : ind + width] for ind in range(0, len(string), width)
+        ]
+    cache, substrings = _CHR_WIDS, list()
+    # start 为当前子字符串起始索引，curwid 为当前子字符串宽度
+    start, curwid = 0, 0
+    for index, char in enumerate(string):
+        if char == _LNSEP or char == '\n':
+            # 换行符宽度计为 0，当前子字符串宽度恰好等于 width 时换行符归入该子字符串
+            if curwid == width:
+                substrings.append(string[start : index + 1])
+            else:
+                substrings.append(string[start:index])
+            start, curwid = index + 1, 0
+            continue
+        char_wid = cache.get(char)
+        if char_wid is None:
+            char_wid = _chr_wid(char)
+        curwid += char_wid
+        if curwid > width:
+            # 加上本字符就超宽，本字符归入下一个子字符串
+            substrings.append(string[start:index])
+            start, curwid = index, char_wid
+        if curwid == width:
+            substrings.append(string[start : index + 1])
+            start, curwid = index + 1, 0
+    if start < len(string):
         substrings.append(string[start:])
     return substrings
 
 
 def _rsplit(string, width):
+    '''
+    从右往左将字符串 string 按宽度 width 切分成多个子字符串（遇换行符也切分）。
+    与 _lsplit 相同，只遍历一次字符串，子字符串先逆序收集，最后一次性反转。
+    :param string: str，要切分的字符串。
+    :param width: int，子字符串的最大宽度。
+    :return: list[str]，切分后的子字符串列表。
+    '''
     if not isinstance(string, str):
         raise TypeError('Type of value of parameter <string> should be "str".')
     if width < _max_char_wid(string):
@@ -1770,21 +4798,40 @@ def _rsplit(string, width):
     if not string:
         return [string]
     lenstr = len(string)
-    start, stop, substrings = lenstr - 1, lenstr, list()
-    while start >= 0:
-        strwid = _str_wid(string[start:stop])
-        if strwid == width:
-            substrings.insert(0, string[start:stop])
-            start, stop = start - 1, start
-        elif strwid > width:
-            substrings.insert(0, string[start + 1 : stop])
-            stop = start + 1
-        elif string[start] == '\n' or string[start] == _LNSEP:
-            substrings.insert(0, string[start + 1 : stop])
-            stop = start
-            start -= 1
-        else:
-            start -= 1
+    if _isascii(string) and string.isprintable():
+        # 可打印 ASCII 字符宽度都是 1，从右往左按 width 等长切分
+        head = lenstr % width
+        substrings = [string[:head]] if head else list()
+        substrings.extend(
+            string[ind : ind + width] for ind in range(head, lenstr, width)
+        )
+        return substrings
+    cache, substrings = _CHR_WIDS, list()
+    # stop 为当前子字符串结束索引（不包含），curwid 为当前子字符串宽度
+    stop, curwid = lenstr, 0
+    for index in range(lenstr - 1, -1, -1):
+        char = string[index]
+        if char == '\n' or char == _LNSEP:
+            if curwid == width:
+                substrings.append(string[index:stop])
+            else:
+                substrings.append(string[index + 1 : stop])
+            stop, curwid = index, 0
+            continue
+        char_wid = cache.get(char)
+        if char_wid is None:
+            char_wid = _chr_wid(char)
+        curwid += char_wid
+        if curwid == width:
+            substrings.append(string[index:stop])
+            stop, curwid = index, 0
+        elif curwid > width:
+            substrings.append(string[index + 1 : stop])
+            stop, curwid = index + 1, char_wid
+            if curwid == width:
+                substrings.append(string[index:stop])
+                stop, curwid = index, 0
     if stop > 0:
-        substrings.insert(0, string[:stop])
+        substrings.append(string[:stop])
+    substrings.reverse()
     return substrings
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+
+# numpy 数组基准测试：比较把数组转换为列表后 addRows 与 Table.fromArray 整列测量创建
+# 表格的耗时；装有 pandas 时再比较 DataFrame 逐行 addRow 与 Table.fromDataFrame。
+# 需要 numpy（pandas 可选），ColorfulTable 本身不依赖它们。
+# 用法：python benchmarks/bench_array.py [行数]
+
+import os
+import sys
+from time import perf_counter
+
+import numpy
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ColorfulTable import Table
+
+try:
+    import pandas
+except ImportError:
+    pandas = None
+
+HEADER = ['序号', '名称', '状态', '耗时', '成功', '说明']
+
+
+def timed(label, build):
+    begin = perf_counter()
+    table = build()
+    print('%-20s %8.3f s' % (label, perf_counter() - begin))
+    return table.getText()
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    index = numpy.arange(rows)
+    array = numpy.empty(
+        rows,
+        dtype=[
+            ('序号', 'i8'),
+            ('名称', 'U16'),
+            ('状态', 'U8'),
+            ('耗时', 'f8'),
+            ('成功', '?'),
+            ('说明', 'O'),
+        ],
+    )
+    array['序号'] = index
+    array['名称'] = numpy.char.add('job-', index.astype(str))
+    # 一列含中文，走逐个单元格测量的回退路径
+    array['状态'] = numpy.where(index % 3 == 0, 'failed', '完成')
+    array['耗时'] = index * 0.37
+    array['成功'] = index % 3 != 0
+    # 对象列中混入 bytes，其字符串形式应与 addRow 一样是 b'...'
+    array['说明'] = [
+        b'raw' if i % 10 == 0 else 'x' * (i % 50) for i in range(rows)
+    ]
+    texts = set()
+
+    def by_rows():
+        table = Table(HEADER)
+        table.addRows(array.tolist())
+        return table
+
+    texts.add(timed('tolist+addRows', by_rows))
+    texts.add(timed('fromArray', lambda: Table.fromArray(array)))
+    if pandas is not None:
+        frame = pandas.DataFrame(array)
+
+        def by_frame_rows():
+            table = Table(HEADER)
+            for row in frame.itertuples(index=False):
+                table.addRow(row)
+            return table
+
+        texts.add(timed('itertuples+addRow', by_frame_rows))
+        texts.add(timed('fromDataFrame', lambda: Table.fromDataFrame(frame)))
+    # 各种方式创建的表格应相同
+    assert len(texts) == 1
+
+
+if __name__ == '__main__':
+    main()
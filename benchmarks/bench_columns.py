@@ -0,0 +1,57 @@
+# -*- coding: utf-8 -*-
+
+# 列操作基准测试：比较按行存储的 Table 与按列存储的 ColumnTable 的增删列、获取列和
+# 输出耗时。
+# 用法：python benchmarks/bench_columns.py [行数]
+
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ColorfulTable import ColumnTable, Table
+
+
+def timed(func):
+    begin = perf_counter()
+    func()
+    return perf_counter() - begin
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    data = [(i, 'job-%d' % i, 'x' * (i % 50)) for i in range(rows)]
+    column = ['备注%d' % (i % 100) for i in range(rows)]
+    texts = set()
+    print(
+        '%-12s %10s %10s %10s %10s %10s'
+        % ('', 'addRows', 'addColumn', 'getColumn', 'delColumn', 'getText')
+    )
+    for cls in (Table, ColumnTable):
+        table = cls(['序号', '名称', '说明'])
+        costs = (
+            timed(lambda: table.addRows(data)),
+            timed(lambda: table.addColumn(1, column)),
+            timed(lambda: [table.getColumn(i) for i in range(4)]),
+            timed(lambda: table.delColumn(1)),
+            timed(lambda: texts.add(table.getText())),
+        )
+        print('%-12s' % cls.__name__ + ''.join('%9.3fs ' % c for c in costs))
+    # 两种存储方式输出的表格应相同
+    assert len(texts) == 1
+    # 通过"行"直接覆写单元格后再调用 writeCell、delRow，列宽计数应仍然正确
+    texts = set()
+    for cls in (Table, ColumnTable):
+        table = cls(['序号', '名称', '说明'])
+        table.addRows(data[:100])
+        table[1][2] = 'x' * 60
+        table.writeCell(1, 2, value='y')
+        table[2][2] = 'x' * 60
+        table.delRow(2)
+        texts.add(table.getText())
+    assert len(texts) == 1
+
+
+if __name__ == '__main__':
+    main()
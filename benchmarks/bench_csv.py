@@ -0,0 +1,70 @@
+# -*- coding: utf-8 -*-
+
+# CSV 导入基准测试：比较 csv.reader 逐行 addRow 与 Table.fromCSV 导入同一个 CSV 文件
+# 的耗时，以及 fromCSV 只选取部分列时的耗时。
+# 用法：python benchmarks/bench_csv.py [行数]
+
+import csv
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ColorfulTable import Table
+
+HEADER = ['序号', '名称', '状态', '说明', '主机', '耗时', '用户', '备注']
+
+
+def by_rows(path):
+    with open(path, encoding='utf-8', newline='') as file:
+        rows = csv.reader(file)
+        table = Table(next(rows))
+        for row in rows:
+            table.addRow(row)
+    return table
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    path = os.path.join(tempfile.mkdtemp(), 'bench.csv')
+    with open(path, 'w', encoding='utf-8', newline='') as file:
+        writer = csv.writer(file)
+        writer.writerow(HEADER)
+        for i in range(rows):
+            writer.writerow(
+                (
+                    i,
+                    'job-%d' % i,
+                    '完成' if i % 3 else 'failed',
+                    'x' * (i % 50),
+                    'host%d' % (i % 17),
+                    i * 0.37,
+                    'user%d' % (i % 101),
+                    '备注' * (i % 7),
+                )
+            )
+    print('file %31.1f MB' % (os.path.getsize(path) / 1024 / 1024))
+    texts = set()
+    cases = (
+        ('reader+addRow', lambda: by_rows(path)),
+        ('fromCSV', lambda: Table.fromCSV(path)),
+        (
+            'fromCSV 2 cols',
+            lambda: Table.fromCSV(path, columns=['序号', '状态']),
+        ),
+    )
+    for label, load in cases:
+        begin = perf_counter()
+        table = load()
+        print('%-16s %17.3f s' % (label, perf_counter() - begin))
+        if table._num_cols == len(HEADER):
+            texts.add(table.getText())
+    os.remove(path)
+    # 两种方式导入的表格应相同
+    assert len(texts) == 1
+
+
+if __name__ == '__main__':
+    main()
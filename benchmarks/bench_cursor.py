@@ -0,0 +1,96 @@
+# -*- coding: utf-8 -*-
+
+# 数据库游标基准测试：以内存中的 sqlite3 数据库为例，比较 fetchall 后逐行 addRow 与
+# Table.fromCursor 分批 fetchmany 创建表格的内存峰值和耗时，以及 StreamTable.fromCursor
+# 边查询边输出时输出第一行所需的时间。
+# 用法：python benchmarks/bench_cursor.py [行数]
+
+import io
+import os
+import sqlite3
+import sys
+import tracemalloc
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ColorfulTable import StreamTable, Table
+
+QUERY = 'SELECT * FROM jobs'
+
+
+def by_rows(db):
+    cursor = db.execute(QUERY)
+    rows = cursor.fetchall()
+    table = Table([column[0] for column in cursor.description])
+    for row in rows:
+        table.addRow(row)
+    return table
+
+
+def by_cursor(db):
+    return Table.fromCursor(db.execute(QUERY))
+
+
+class FirstWrite(io.StringIO):
+    '''
+    记录第一次写入数据行（第 4 次写入：hat、标题行、neck 之后）的时间。
+    '''
+
+    def __init__(self):
+        super().__init__()
+        self.writes = 0
+        self.first = None
+
+    def write(self, text):
+        self.writes += 1
+        if self.writes == 4:
+            self.first = perf_counter()
+        return super().write(text)
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    db = sqlite3.connect(':memory:')
+    db.execute(
+        'CREATE TABLE jobs (id INTEGER, name TEXT, state TEXT, note TEXT)'
+    )
+    db.executemany(
+        'INSERT INTO jobs VALUES (?, ?, ?, ?)',
+        (
+            (i, 'job-%d' % i, '完成' if i % 3 else 'failed', 'x' * (i % 50))
+            for i in range(rows)
+        ),
+    )
+    texts = set()
+    for label, build in (
+        ('fetchall+addRow', by_rows),
+        ('fromCursor', by_cursor),
+    ):
+        begin = perf_counter()
+        table = build(db)
+        cost = perf_counter() - begin
+        texts.add(table.getText())
+        del table
+        # 耗时和内存峰值分两次测量，tracemalloc 会大大拖慢执行
+        tracemalloc.start()
+        build(db)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+        print(
+            '%-16s %8.3f s  peak %8.2f MB' % (label, cost, peak / 1024 / 1024)
+        )
+    # 两种方式创建的表格应相同
+    assert len(texts) == 1
+    file = FirstWrite()
+    begin = perf_counter()
+    StreamTable.fromCursor(db.execute(QUERY), file=file, color=False)
+    end = perf_counter()
+    print(
+        '%-16s %8.3f s  first row after %.3f s'
+        % ('stream', end - begin, file.first - begin)
+    )
+
+
+if __name__ == '__main__':
+    main()
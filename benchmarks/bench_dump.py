@@ -0,0 +1,73 @@
+# -*- coding: utf-8 -*-
+
+# 导出大表格基准测试：比较 show 写入文本文件与 dump 写入二进制文件、文件描述符。
+# 用法：python benchmarks/bench_dump.py [行数]
+
+import os
+import sys
+import tempfile
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ColorfulTable import Table
+
+
+def make_table(rows):
+    table = Table(['序号', '名称', '状态', '说明'])
+    table.addRows(
+        (i, 'job-%d' % i, '完成' if i % 3 else 'failed', 'x' * (i % 50))
+        for i in range(rows)
+    )
+    # 先渲染一次并缓存（不带颜色的）行文本，下面只比较输出本身的开销
+    for _ in table.iterLines(cache=True):
+        pass
+    return table
+
+
+def timed(label, func, path):
+    begin = perf_counter()
+    func()
+    cost = perf_counter() - begin
+    size = os.path.getsize(path)
+    print(
+        '%-24s %8.3f s  %8.1f MB/s' % (label, cost, size / cost / 1024 / 1024)
+    )
+    return size
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 200000
+    table = make_table(rows)
+    fd, path = tempfile.mkstemp(suffix='.txt')
+    os.close(fd)
+    try:
+
+        def show_text():
+            # show 会关闭它打开的文本文件
+            table.show(file=open(path, 'w', encoding='utf-8'), color=False)
+
+        def dump_binary():
+            with open(path, 'wb') as file:
+                table.dump(file, cache=True)
+
+        def dump_fd():
+            fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC)
+            try:
+                table.dump(fd, cache=True)
+            finally:
+                os.close(fd)
+
+        sizes = {
+            timed('show(text file)', show_text, path),
+            timed('dump(binary file)', dump_binary, path),
+            timed('dump(fd)', dump_fd, path),
+        }
+        # 三种方式输出的字节数应相同
+        assert len(sizes) == 1, sizes
+    finally:
+        os.remove(path)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,69 @@
+# -*- coding: utf-8 -*-
+
+# 导入耗时基准测试：用 python -X importtime 测量 import ColorfulTable 的耗时，并检查
+# 导入时没有连带导入 idlelib、tkinter、colorama 等模块（它们推迟到第一次彩色渲染时），
+# 也没有导入 numpy、pandas（fromArray 等方法只调用传入的对象的方法）。
+# 用法：python benchmarks/bench_import.py [耗时预算(毫秒)] [重复次数]
+# 耗时超出预算或导入了不该导入的模块时以非 0 状态码退出。
+
+import os
+import re
+import subprocess
+import sys
+from compileall import compile_dir
+
+ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# 导入 ColorfulTable 时不应导入的模块
+HEAVY = ('idlelib', 'tkinter', 'colorama', 'numpy', 'pandas')
+
+PROBE = '''
+import sys
+sys.path.insert(0, %r)
+import ColorfulTable
+print(' '.join(sorted(sys.modules)))
+''' % ROOT
+
+
+def importtime(code):
+    '''
+    在新的解释器进程中执行 code，返回 ColorfulTable 的累计导入耗时（微秒）和已导入
+    的模块名。
+    '''
+    env = dict(os.environ)
+    # 使用已编译的 pyc 文件，只测量导入本身的耗时
+    env.pop('PYTHONDONTWRITEBYTECODE', None)
+    result = subprocess.run(
+        [sys.executable, '-X', 'importtime', '-c', code],
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    match = re.search(r'\|\s*(\d+)\s*\|\s*ColorfulTable$', result.stderr, re.M)
+    return int(match.group(1)), result.stdout.split()
+
+
+def main():
+    budget = float(sys.argv[1]) if len(sys.argv) > 1 else 30.0
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 7
+    compile_dir(os.path.join(ROOT, 'ColorfulTable'), quiet=1)
+    costs, modules = [], []
+    for _ in range(repeat):
+        cost, modules = importtime(PROBE)
+        costs.append(cost)
+    best = min(costs) / 1000
+    print('import ColorfulTable %8.2f ms (best of %d)' % (best, repeat))
+    heavy = sorted(name for name in modules if name.split('.')[0] in HEAVY)
+    failed = False
+    if heavy:
+        print('imported at import time: %s' % ', '.join(heavy))
+        failed = True
+    if best > budget:
+        print('over budget: %.2f ms > %.2f ms' % (best, budget))
+        failed = True
+    sys.exit(1 if failed else 0)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,48 @@
+# -*- coding: utf-8 -*-
+
+# 并行渲染基准测试：比较 getText 不并行与 workers 个进程并行渲染同一表格的耗时，并
+# 检查输出完全相同。每次都用新建的表格，不受行文本缓存影响。
+# 用法：python benchmarks/bench_parallel.py [行数] [最大进程数]
+
+import os
+import sys
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ColorfulTable import Table
+
+
+def build(data):
+    table = Table(['序号', '名称', '状态', '说明'], fbgc={'fg_green'})
+    table.addRows(data)
+    return table
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 1000000
+    most = int(sys.argv[2]) if len(sys.argv) > 2 else os.cpu_count() or 1
+    data = [
+        (i, 'job-%d' % i, '完成' if i % 3 else 'failed', 'x' * (i % 120))
+        for i in range(rows)
+    ]
+    texts = set()
+    serial = None
+    workers = 1
+    while workers <= max(most, 2):
+        table = build(data)
+        begin = perf_counter()
+        texts.add(table.getText(color=True, workers=workers))
+        cost = perf_counter() - begin
+        serial = serial or cost
+        print(
+            'workers %-3d %8.3f s  speedup %5.2fx'
+            % (workers, cost, serial / cost)
+        )
+        workers *= 2
+    # 并行渲染的输出应与不并行时完全相同
+    assert len(texts) == 1
+
+
+if __name__ == '__main__':
+    main()
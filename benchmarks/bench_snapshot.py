@@ -0,0 +1,60 @@
+# -*- coding: utf-8 -*-
+
+# 快照基准测试：测量创建快照的耗时，以及另一个线程输出快照期间，修改原表格的
+# writeCell、addRow 调用的耗时（不会等待输出完成）。
+# 用法：python benchmarks/bench_snapshot.py [行数] [修改次数]
+
+import os
+import sys
+import threading
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ColorfulTable import Table
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    edits = int(sys.argv[2]) if len(sys.argv) > 2 else 20000
+    table = Table(['序号', '名称', '状态', '说明'])
+    table.addRows(
+        (i, 'job-%d' % i, '完成' if i % 3 else 'failed', 'x' * (i % 50))
+        for i in range(rows)
+    )
+    begin = perf_counter()
+    snap = table.snapshot()
+    print('snapshot %24.3f ms' % ((perf_counter() - begin) * 1000))
+    expected = snap.getText()
+    snap = table.snapshot()
+    result = dict()
+
+    def report():
+        begin = perf_counter()
+        result['text'] = snap.getText()
+        result['cost'] = perf_counter() - begin
+
+    reporter = threading.Thread(target=report)
+    reporter.start()
+    costs = list()
+    for i in range(edits):
+        begin = perf_counter()
+        table.writeCell(i % rows + 1, 3, value='changed %d' % i)
+        if i % 10 == 0:
+            table.addRow(['new', i, '', ''])
+        costs.append(perf_counter() - begin)
+    writing = sum(costs)
+    reporter.join()
+    costs.sort()
+    print('render snapshot %17.3f s' % result['cost'])
+    print('%d edits during render %8.3f s' % (edits, writing))
+    print(
+        'edit latency  median %.3f ms  max %.3f ms'
+        % (costs[len(costs) // 2] * 1000, costs[-1] * 1000)
+    )
+    # 修改原表格不影响快照的输出
+    assert result['text'] == expected
+
+
+if __name__ == '__main__':
+    main()
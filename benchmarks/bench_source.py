@@ -0,0 +1,63 @@
+# -*- coding: utf-8 -*-
+
+# 行数据源基准测试：比较把数据复制进 Table（addRows）与 Table.fromSource 直接以数据
+# 源创建表格时，建表并逐行输出整个表格的内存峰值（不含数据源本身）和耗时。
+# 用法：python benchmarks/bench_source.py [行数]
+
+import os
+import sys
+import tracemalloc
+from time import perf_counter
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ColorfulTable import Table
+
+HEADER = ['序号', '名称', '状态', '说明']
+
+
+def copied(data):
+    table = Table(HEADER)
+    table.addRows(data)
+    return table
+
+
+def wrapped(data):
+    return Table.fromSource(HEADER, data)
+
+
+def measure(build, data):
+    # 耗时和内存峰值分两次测量，tracemalloc 会大大拖慢执行
+    begin = perf_counter()
+    # 逐行生成、丢弃，不拼接整个表格的字符串
+    lines = sum(1 for _ in build(data).iterLines())
+    cost = perf_counter() - begin
+    tracemalloc.start()
+    sum(1 for _ in build(data).iterLines())
+    peak = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+    return lines, cost, peak
+
+
+def main():
+    rows = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    tracemalloc.start()
+    data = [
+        (i, 'job-%d' % i, '完成' if i % 3 else 'failed', 'x' * (i % 50))
+        for i in range(rows)
+    ]
+    source = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+    print('source data %26.2f MB' % (source / 1024 / 1024))
+    results = set()
+    for label, build in (('addRows', copied), ('fromSource', wrapped)):
+        lines, cost, peak = measure(build, data)
+        results.add(lines)
+        print(
+            '%-12s %8.3f s  peak %8.2f MB' % (label, cost, peak / 1024 / 1024)
+        )
+    assert len(results) == 1
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,65 @@
+# -*- coding: utf-8 -*-
+
+# 字符宽度计算微基准测试：对比逐区间线性比较（旧 if 链的查找方式）与
+# 当前 ctcore 中"宽度表二分查找 + 字符缓存 + ASCII 快速通道"的耗时。
+# 用法：python benchmarks/bench_width.py
+
+import os
+import sys
+from timeit import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ColorfulTable import ctcore
+
+
+def linear_chr_wid(char):
+    '''逐区间比较，与旧版 _chr_wid 的 if 链查找方式相同。'''
+    code = ord(char)
+    # 旧 if 链第一项就是可打印 ASCII 字符
+    if 0x0021 <= code <= 0x007E:
+        return 1
+    for start, end, width in ctcore._WIDTH_RANGES:
+        if start <= code <= end:
+            return width
+    return 1
+
+
+def linear_str_wid(string):
+    return max(sum(linear_chr_wid(c) for c in s) for s in string.split('\n'))
+
+
+def make_column(kind, rows=2000):
+    ascii_cell = 'status=ok id=%d user=someone@example.com'
+    cjk_cell = '任务%d 已完成，耗时较长的汉字内容'
+    cells = list()
+    for i in range(rows):
+        if kind == 'ascii' or (kind == 'mixed' and i % 2):
+            cells.append(ascii_cell % i)
+        else:
+            cells.append(cjk_cell % i)
+    return cells
+
+
+def bench(func, column, number=5):
+    best = min(
+        repeat(lambda: [func(s) for s in column], number=number, repeat=3)
+    )
+    return best / number / len(column) * 1e6
+
+
+def main():
+    for kind in ('ascii', 'cjk', 'mixed'):
+        column = make_column(kind)
+        for string in column:
+            assert linear_str_wid(string) == ctcore._str_wid(string)
+        old = bench(linear_str_wid, column)
+        new = bench(ctcore._str_wid, column)
+        print(
+            '%-6s linear: %7.2f us/cell   table: %7.2f us/cell   x%.1f'
+            % (kind, old, new, old / new)
+        )
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+# -*- coding: utf-8 -*-
+
+# 单元格折行（_lsplit / _rsplit）基准测试：单元格大小从 10 B 到 1 MB，
+# 每增大 10 倍耗时也应只增大约 10 倍（线性）。
+# 用法：python benchmarks/bench_wrap.py
+
+import os
+import sys
+from timeit import repeat
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from ColorfulTable import ctcore
+
+WIDTH = 40
+SAMPLE = 'log line: 任务已完成 status=ok\n'
+
+
+def make_cell(size):
+    return (SAMPLE * (size // len(SAMPLE) + 1))[:size]
+
+
+def main():
+    last = None
+    for size in (10, 100, 1000, 10000, 100000, 1000000):
+        cell = make_cell(size)
+        number = max(1, 100000 // size)
+        for func in (ctcore._lsplit, ctcore._rsplit):
+            best = min(
+                repeat(lambda: func(cell, WIDTH), number=number, repeat=3)
+            )
+            cost = best / number
+            print(
+                '%-8s %8d B  %10.3f ms  %7.1f ns/char'
+                % (func.__name__, size, cost * 1e3, cost / size * 1e9)
+            )
+        last = cell
+    # 左切分与右切分结果拼接回去应与原字符串（去掉换行符）一致
+    assert ''.join(ctcore._lsplit(last, WIDTH)) == last.replace('\n', '')
+    assert ''.join(ctcore._rsplit(last, WIDTH)) == last.replace('\n', '')
+
+
+if __name__ == '__main__':
+    main()